@@ -1,169 +1,505 @@
+import os
 import time
+import zlib
+import atexit
+import shutil
+import tempfile
+import heapq
+import threading
 import hashlib
 import logging
-from typing import Dict, Optional, List, Any
-from datetime import datetime, timedelta
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import Dict, Optional, List, Any, Tuple, Union, Iterator, BinaryIO
+from datetime import datetime
 from dataclasses import dataclass
 
 
 # Configure logging for cache manager
 logger = logging.getLogger(__name__)
 
-@dataclass
+# File extension -> language name
+_SUFFIX_LANG = {
+    '.py': 'Python',
+    '.java': 'Java',
+    '.js': 'JavaScript',
+    '.jsx': 'JavaScript',
+}
+
+def format_timestamp(timestamp: float) -> str:
+    """Convert a unix timestamp to a local ISO 8601 string"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+def _iter_slices(content: bytes, chunk_size: int) -> Iterator[bytes]:
+    """Yield consecutive chunk_size slices of in-memory content"""
+    view = memoryview(content)
+    for start in range(0, len(content), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+
+def _iter_file(spool: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Yield chunk_size reads from an open file, closing it when done"""
+    with spool:
+        while chunk := spool.read(chunk_size):
+            yield chunk
+
+@dataclass(slots=True)
 class CachedFile:
     """Represents a cached file with metadata"""
     filename: str
-    content: str
+    content: Optional[bytes]  # zlib-compressed UTF-8; None when spooled to disk
     language: str
     file_type: str  # 'uploaded' or 'generated'
-    upload_time: datetime
+    upload_time: float  # unix seconds
     file_size: int
     file_hash: str
-    expires_at: datetime
+    expires_at: float  # unix seconds
+    spool_path: Optional[str] = None
+    
+    def read_bytes(self) -> bytes:
+        """
+        File content as bytes, decompressed or read from the spool file
+        
+        Raises OSError if the entry has since been evicted and its spool file
+        unlinked; callers treat that as a cache miss.
+        """
+        if self.content is not None:
+            return zlib.decompress(self.content)
+        with open(self.spool_path, 'rb') as spool:
+            return spool.read()
+    
+    def iter_chunks(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        File content as a stream of byte chunks
+        
+        A spool file is opened right away, so the stream stays readable even
+        if the entry is evicted (and its spool file unlinked) mid-download.
+        """
+        if self.content is not None:
+            return _iter_slices(zlib.decompress(self.content), chunk_size)
+        return _iter_file(open(self.spool_path, 'rb'), chunk_size)
+    
+    @property
+    def text(self) -> str:
+        """File content decoded as UTF-8"""
+        return self.read_bytes().decode('utf-8', errors='replace')
 
 class FileCache:
     """In-memory cache for uploaded and generated files"""
     
-    def __init__(self, max_files: int = 100, expiration_hours: int = 24):
-        self.cache: Dict[str, CachedFile] = {}
+    def __init__(self, max_files: int = 100, expiration_hours: int = 24,
+                 spool_threshold: int = 64 * 1024):
+        # Insertion order doubles as recency order: oldest entries sit at the front
+        self.cache: "OrderedDict[str, CachedFile]" = OrderedDict()
         self.max_files = max_files
         self.expiration_hours = expiration_hours
+        self._expiration_seconds = expiration_hours * 3600
+        # Min-heap of (expires_at, file_id); entries for deleted files are skipped lazily
+        self._exp_heap: List[Tuple[float, str]] = []
+        # Expirations are hour-granular, so sweeping at most once a minute is plenty
+        self._last_cleanup: float = 0.0
+        self._cleanup_interval: float = 60.0
+        # (file_hash, filename, file_type) -> file_id, used to detect duplicate uploads
+        self._hash_index: Dict[Tuple[str, str, str], str] = {}
+        # Generated markdown and refactoring suggestions per content hash and
+        # language, kept while any cached file still holds that content;
+        # _hash_refs counts those files
+        self._parse_cache: Dict[str, Dict[str, str]] = {}
+        self._suggestion_cache: Dict[str, Dict[str, List[str]]] = {}
+        self._hash_refs: Counter = Counter()
+        # Access frequency per content hash (TinyLFU-style); outlives evictions so
+        # a returning hot file is recognised. Counts are halved periodically.
+        self._sketch: Counter = Counter()
+        self._sketch_increments = 0
+        self._sketch_sample_size = 10 * max_files
+        # How many hot LRU victims may be skipped before evicting regardless
+        self._max_second_chances = 4
+        # Content larger than spool_threshold bytes is kept on disk, not in memory
+        self.spool_threshold = spool_threshold
+        self._spool_dir = tempfile.mkdtemp(prefix='codenarrator_cache_')
+        atexit.register(shutil.rmtree, self._spool_dir, ignore_errors=True)
+        # Guards every structure above; reentrant so public methods can nest helpers
+        self._lock = threading.RLock()
+    
+    @staticmethod
+    def _hash_content(content: bytes) -> str:
+        """Hash file content for identity (BLAKE2b; not used for security)"""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
     
-    def _generate_file_id(self, filename: str, content: str) -> str:
-        """Generate unique ID for file based on filename and content hash"""
-        content_hash = hashlib.md5(content.encode()).hexdigest()[:8]
-        timestamp = int(time.time())
-        return f"{filename}_{content_hash}_{timestamp}"
+    @staticmethod
+    def _index_key(cached_file: CachedFile) -> Tuple[str, str, str]:
+        """Key under which a cached file is registered in the duplicate index"""
+        return (cached_file.file_hash, cached_file.filename, cached_file.file_type)
+    
+    def _unindex(self, file_id: str, cached_file: CachedFile):
+        """Drop the duplicate-index entry for a file that is leaving the cache"""
+        key = self._index_key(cached_file)
+        if self._hash_index.get(key) == file_id:
+            del self._hash_index[key]
+    
+    def _discard(self, file_id: str, cached_file: CachedFile):
+        """Release everything held for a file that is leaving the cache"""
+        self._unindex(file_id, cached_file)
+        self._hash_refs[cached_file.file_hash] -= 1
+        if self._hash_refs[cached_file.file_hash] <= 0:
+            del self._hash_refs[cached_file.file_hash]
+            self._parse_cache.pop(cached_file.file_hash, None)
+            self._suggestion_cache.pop(cached_file.file_hash, None)
+        if cached_file.spool_path:
+            try:
+                os.unlink(cached_file.spool_path)
+            except OSError as e:
+                logger.warning(f"Failed to remove spool file {cached_file.spool_path}: {e}")
+    
+    def _spool(self, content: bytes) -> str:
+        """Write content to a new file in the spool directory and return its path"""
+        fd, path = tempfile.mkstemp(dir=self._spool_dir)
+        with os.fdopen(fd, 'wb') as spool:
+            spool.write(content)
+        return path
+    
+    def _record_access(self, file_hash: str):
+        """Bump the frequency sketch, ageing all counts once the sample is full"""
+        self._sketch[file_hash] += 1
+        self._sketch_increments += 1
+        if self._sketch_increments >= self._sketch_sample_size:
+            self._sketch = Counter({
+                key: count // 2 for key, count in self._sketch.items() if count > 1
+            })
+            self._sketch_increments = 0
+    
+    def _generate_file_id(self, filename: str, content_hash_prefix: str) -> str:
+        """Generate unique ID for file based on filename and content hash prefix"""
+        return f"{filename}_{content_hash_prefix}_{int(time.time())}"
     
     def _cleanup_expired(self):
         """Remove expired files from cache"""
-        now = datetime.now()
-        expired_keys = [
-            key for key, cached_file in self.cache.items()
-            if cached_file.expires_at < now
+        now_ts = time.monotonic()
+        if now_ts - self._last_cleanup < self._cleanup_interval:
+            return
+        self._last_cleanup = now_ts
+        
+        now = time.time()
+        expired_keys = []
+        while self._exp_heap and self._exp_heap[0][0] < now:
+            expires_at, key = heapq.heappop(self._exp_heap)
+            cached_file = self.cache.get(key)
+            # Skip heap entries left behind by deleted, evicted or re-stored files
+            if cached_file is not None and cached_file.expires_at <= expires_at:
+                expired_keys.append(key)
+        if not expired_keys:
+            return
+        
+        logger.info(f"Cleaning up {len(expired_keys)} expired files from cache")
+        if len(expired_keys) > len(self.cache) // 4:
+            # Bulk expiry (e.g. after a long idle period): rebuild once instead of N deletes
+            expired = set(expired_keys)
+            for key in expired_keys:
+                self._discard(key, self.cache[key])
+            self.cache = OrderedDict(
+                (key, cached_file) for key, cached_file in self.cache.items()
+                if key not in expired
+            )
+        else:
+            for key in expired_keys:
+                self._discard(key, self.cache.pop(key))
+    
+    def _compact_expiration_heap(self):
+        """Drop stale heap entries once they outnumber the live cache entries"""
+        if len(self._exp_heap) <= 2 * max(len(self.cache), self.max_files):
+            return
+        self._exp_heap = [
+            (cached_file.expires_at, key) for key, cached_file in self.cache.items()
         ]
-        if expired_keys:
-            logger.info(f"Cleaning up {len(expired_keys)} expired files from cache")
-        for key in expired_keys:
-            del self.cache[key]
+        heapq.heapify(self._exp_heap)
     
-    def _enforce_size_limit(self):
-        """Remove oldest files if cache exceeds max_files limit"""
+    def _enforce_size_limit(self, incoming_hash: Optional[str] = None, incoming_id: Optional[str] = None):
+        """
+        Remove least recently used files if cache exceeds max_files limit.
+        
+        A victim that has been read more often than the incoming file is spared
+        so one-off uploads cannot flush hot files; at most _max_second_chances
+        victims are spared per call. Spared files stay where they are, keeping
+        the recency order, and the incoming file (incoming_id) is never evicted
+        while another entry remains.
+        """
         if len(self.cache) <= self.max_files:
             return
         
         files_to_remove = len(self.cache) - self.max_files
         logger.info(f"Cache size limit exceeded ({len(self.cache)}/{self.max_files}), removing {files_to_remove} oldest files")
         
-        # Sort by upload time and remove oldest
-        sorted_items = sorted(
-            self.cache.items(),
-            key=lambda x: x[1].upload_time
-        )
+        incoming_frequency = self._sketch.get(incoming_hash, 0) if incoming_hash else 0
+        spared = set()
         
-        # Remove oldest files until we're under the limit
-        for i in range(files_to_remove):
-            key = sorted_items[i][0]
-            filename = sorted_items[i][1].filename
-            logger.debug(f"Removing oldest file from cache: {filename} (ID: {key})")
-            del self.cache[key]
+        # Least recently used entries are at the front, no sorting needed
+        while len(self.cache) > self.max_files:
+            victim = None
+            for key in self.cache:
+                if key == incoming_id or key in spared:
+                    continue
+                victim_frequency = self._sketch.get(self.cache[key].file_hash, 0)
+                if len(spared) < self._max_second_chances and victim_frequency > incoming_frequency:
+                    spared.add(key)
+                    continue
+                victim = key
+                break
+            if victim is None:
+                # Only spared entries are left: fall back to plain LRU
+                victim = next((key for key in self.cache if key != incoming_id), incoming_id)
+            cached_file = self.cache.pop(victim)
+            self._discard(victim, cached_file)
+            logger.debug(f"Removing oldest file from cache: {cached_file.filename} (ID: {victim})")
     
     def _detect_language(self, filename: str) -> str:
         """Detect programming language from filename"""
-        filename_lower = filename.lower()
-        if filename_lower.endswith('.py'):
-            return 'Python'
-        elif filename_lower.endswith('.java'):
-            return 'Java'
-        elif filename_lower.endswith(('.js', '.jsx')):
-            return 'JavaScript'
-        else:
-            return 'Unknown'
+        extension = os.path.splitext(filename)[1].lower()
+        return _SUFFIX_LANG.get(extension, 'Unknown')
     
-    def store_file(self, filename: str, content: str, file_type: str = 'uploaded') -> str:
+    def store_file(self, filename: str, content: Union[str, bytes], file_type: str = 'uploaded') -> str:
         """
         Store file in cache and return unique file ID
         
         Args:
             filename: Original filename
-            content: File content
+            content: File content; raw upload bytes are stored as-is, text is UTF-8 encoded
             file_type: 'uploaded' or 'generated'
         
         Returns:
             Unique file ID for retrieval
         """
-        logger.info(f"Storing file in cache - Filename: {filename}, Type: {file_type}, Size: {len(content)} chars")
+        if isinstance(content, str):
+            content = content.encode('utf-8')
         
-        self._cleanup_expired()
+        logger.info(f"Storing file in cache - Filename: {filename}, Type: {file_type}, Size: {len(content)} bytes")
         
-        file_id = self._generate_file_id(filename, content)
-        language = self._detect_language(filename)
+        # Hash the content once and reuse it for both the ID and the stored hash
+        full_hash = self._hash_content(content)
+        # A re-upload of cached content is settled before any compression or spooling
+        with self._lock:
+            existing_id = self._reuse_duplicate(full_hash, filename, file_type)
+        if existing_id is not None:
+            return existing_id
+        # Source text compresses several-fold; in-memory entries are kept compressed.
+        # Done before taking the lock so concurrent requests are not held up.
+        spooled = len(content) > self.spool_threshold
+        compressed = None if spooled else zlib.compress(content)
         
-        cached_file = CachedFile(
-            filename=filename,
-            content=content,
-            language=language,
-            file_type=file_type,
-            upload_time=datetime.now(),
-            file_size=len(content),
-            file_hash=hashlib.md5(content.encode()).hexdigest(),
-            expires_at=datetime.now() + timedelta(hours=self.expiration_hours)
-        )
+        return self._insert(filename, file_type, full_hash, len(content), compressed,
+                            spool_content=content if spooled else None)
+    
+    def store_stream(self, filename: str, stream: BinaryIO, file_type: str = 'uploaded') -> str:
+        """
+        Store the remaining content of a binary stream and return its file ID
         
-        self.cache[file_id] = cached_file
-        self._enforce_size_limit()
+        Content over spool_threshold is copied to the spool directory chunk by
+        chunk, so a large upload is never held in memory as a single bytes object.
+        """
+        head = stream.read(self.spool_threshold + 1)
+        if len(head) <= self.spool_threshold:
+            return self.store_file(filename, head, file_type)
         
-        logger.info(f"File stored successfully - ID: {file_id}, Language: {language}, Expires: {cached_file.expires_at}")
+        hasher = hashlib.blake2b(digest_size=16)
+        size = 0
+        fd, spool_path = tempfile.mkstemp(dir=self._spool_dir)
+        with os.fdopen(fd, 'wb') as spool:
+            chunk = head
+            while chunk:
+                hasher.update(chunk)
+                spool.write(chunk)
+                size += len(chunk)
+                chunk = stream.read(64 * 1024)
+        
+        logger.info(f"Storing file in cache - Filename: {filename}, Type: {file_type}, Size: {size} bytes")
+        return self._insert(filename, file_type, hasher.hexdigest(), size, None, spool_path=spool_path)
+    
+    def _reuse_duplicate(self, full_hash: str, filename: str, file_type: str) -> Optional[str]:
+        """
+        Refresh and return the live entry holding identical content, if any
+        
+        Identical re-uploads reuse the existing entry instead of churning the
+        cache. Must be called with the lock held.
+        """
+        existing_id = self._hash_index.get((full_hash, filename, file_type))
+        existing = self.cache.get(existing_id) if existing_id else None
+        now = time.time()
+        if existing is None or existing.expires_at < now:
+            return None
+        existing.expires_at = now + self._expiration_seconds
+        self.cache.move_to_end(existing_id)
+        self._record_access(full_hash)
+        heapq.heappush(self._exp_heap, (existing.expires_at, existing_id))
+        self._compact_expiration_heap()
+        logger.info(f"Duplicate upload detected - Reusing ID: {existing_id}, Expires: {format_timestamp(existing.expires_at)}")
+        return existing_id
+    
+    def _insert(self, filename: str, file_type: str, full_hash: str, file_size: int,
+                compressed: Optional[bytes], spool_content: Optional[bytes] = None,
+                spool_path: Optional[str] = None) -> str:
+        """
+        Register prepared content under a new file ID, or refresh an identical entry
+        
+        Spooled content is passed either as bytes still to be written
+        (spool_content) or as an already written spool file (spool_path).
+        """
+        with self._lock:
+            self._cleanup_expired()
+            now = time.time()
+            
+            # Checked again under this lock: an identical upload may have landed meanwhile
+            existing_id = self._reuse_duplicate(full_hash, filename, file_type)
+            if existing_id is not None:
+                if spool_path:
+                    os.unlink(spool_path)
+                return existing_id
+            
+            file_id = self._generate_file_id(filename, full_hash[:8])
+            language = self._detect_language(filename)
+            if spool_content is not None:
+                spool_path = self._spool(spool_content)
+            
+            cached_file = CachedFile(
+                filename=filename,
+                content=compressed,
+                language=language,
+                file_type=file_type,
+                upload_time=now,
+                file_size=file_size,
+                file_hash=full_hash,
+                expires_at=now + self._expiration_seconds,
+                spool_path=spool_path
+            )
+            
+            previous = self.cache.get(file_id)
+            if previous is not None:
+                self._discard(file_id, previous)
+            self.cache[file_id] = cached_file
+            self.cache.move_to_end(file_id)
+            self._hash_index[self._index_key(cached_file)] = file_id
+            self._hash_refs[full_hash] += 1
+            self._record_access(full_hash)
+            heapq.heappush(self._exp_heap, (cached_file.expires_at, file_id))
+            self._enforce_size_limit(full_hash, file_id)
+            self._compact_expiration_heap()
+            
+            logger.info(f"File stored successfully - ID: {file_id}, Language: {language}, Expires: {format_timestamp(cached_file.expires_at)}")
         
         return file_id
     
     def get_file(self, file_id: str) -> Optional[CachedFile]:
         """Retrieve file from cache by ID"""
         logger.debug(f"Retrieving file from cache - ID: {file_id}")
-        self._cleanup_expired()
-        
-        cached_file = self.cache.get(file_id)
-        if cached_file:
-            logger.info(f"File retrieved successfully - ID: {file_id}, Filename: {cached_file.filename}")
-        else:
-            logger.warning(f"File not found in cache - ID: {file_id}")
+        with self._lock:
+            self._cleanup_expired()
+            
+            cached_file = self.cache.get(file_id)
+            if cached_file and cached_file.expires_at < time.time():
+                # Expired since the last periodic sweep
+                del self.cache[file_id]
+                self._discard(file_id, cached_file)
+                cached_file = None
+            if cached_file:
+                self.cache.move_to_end(file_id)
+                self._record_access(cached_file.file_hash)
+                logger.info(f"File retrieved successfully - ID: {file_id}, Filename: {cached_file.filename}")
+            else:
+                logger.warning(f"File not found in cache - ID: {file_id}")
         
         return cached_file
     
+    def get_parsed(self, file_id: str, language: str) -> Optional[str]:
+        """Return markdown previously generated for a cached file's content, if any"""
+        with self._lock:
+            cached_file = self.cache.get(file_id)
+            if cached_file is None:
+                return None
+            return self._parse_cache.get(cached_file.file_hash, {}).get(language)
+    
+    def store_parsed(self, file_id: str, language: str, markdown: str):
+        """Remember the markdown generated for a cached file's content"""
+        with self._lock:
+            cached_file = self.cache.get(file_id)
+            if cached_file is not None:
+                self._parse_cache.setdefault(cached_file.file_hash, {})[language] = markdown
+    
+    def get_suggestions(self, file_id: str, language: str) -> Optional[List[str]]:
+        """Return suggestions previously generated for a cached file's content, if any"""
+        with self._lock:
+            cached_file = self.cache.get(file_id)
+            if cached_file is None:
+                return None
+            suggestions = self._suggestion_cache.get(cached_file.file_hash, {}).get(language)
+            return list(suggestions) if suggestions is not None else None
+    
+    def store_suggestions(self, file_id: str, language: str, suggestions: List[str]):
+        """Remember the suggestions generated for a cached file's content"""
+        with self._lock:
+            cached_file = self.cache.get(file_id)
+            if cached_file is not None:
+                self._suggestion_cache.setdefault(cached_file.file_hash, {})[language] = list(suggestions)
+    
     def get_recent_files(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get list of recent files with metadata (without content)"""
-        self._cleanup_expired()
-        
-        # Sort by upload time (newest first)
-        sorted_files = sorted(
-            self.cache.items(),
-            key=lambda x: x[1].upload_time,
-            reverse=True
-        )
-        
-        recent_files = []
-        for file_id, cached_file in sorted_files[:limit]:
-            recent_files.append({
-                'file_id': file_id,
-                'filename': cached_file.filename,
-                'language': cached_file.language,
-                'file_type': cached_file.file_type,
-                'upload_time': cached_file.upload_time.isoformat(),
-                'file_size': cached_file.file_size,
-                'expires_at': cached_file.expires_at.isoformat()
-            })
+        with self._lock:
+            self._cleanup_expired()
+            
+            # Walk from the most recently used end (newest first)
+            return [
+                self._file_metadata(file_id, self.cache[file_id])
+                for file_id in islice(reversed(self.cache), limit)
+            ]
+    
+    def search_files(self, language: Optional[str] = None, file_type: Optional[str] = None,
+                     filename: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Filter the `limit` most recent files in one pass (case-insensitive)
+        
+        language and file_type must match exactly; filename matches as a substring.
+        Metadata is only built for files that pass every filter.
+        """
+        language = language.lower() if language else None
+        file_type = file_type.lower() if file_type else None
+        filename = filename.lower() if filename else None
         
-        return recent_files
+        with self._lock:
+            self._cleanup_expired()
+            
+            matches = []
+            for file_id in islice(reversed(self.cache), limit):
+                cached_file = self.cache[file_id]
+                if language and cached_file.language.lower() != language:
+                    continue
+                if file_type and cached_file.file_type.lower() != file_type:
+                    continue
+                if filename and filename not in cached_file.filename.lower():
+                    continue
+                matches.append(self._file_metadata(file_id, cached_file))
+        
+        return matches
+    
+    @staticmethod
+    def _file_metadata(file_id: str, cached_file: CachedFile) -> Dict[str, Any]:
+        """Describe a cached file without its content"""
+        return {
+            'file_id': file_id,
+            'filename': cached_file.filename,
+            'language': cached_file.language,
+            'file_type': cached_file.file_type,
+            'upload_time': format_timestamp(cached_file.upload_time),
+            'file_size': cached_file.file_size,
+            'expires_at': format_timestamp(cached_file.expires_at)
+        }
     
     def delete_file(self, file_id: str) -> bool:
         """Delete file from cache"""
         logger.info(f"Deleting file from cache - ID: {file_id}")
         
-        if file_id in self.cache:
-            filename = self.cache[file_id].filename
-            del self.cache[file_id]
-            logger.info(f"File deleted successfully - ID: {file_id}, Filename: {filename}")
-            return True
+        with self._lock:
+            if file_id in self.cache:
+                cached_file = self.cache.pop(file_id)
+                filename = cached_file.filename
+                self._discard(file_id, cached_file)
+                logger.info(f"File deleted successfully - ID: {file_id}, Filename: {filename}")
+                return True
         
         logger.warning(f"File not found for deletion - ID: {file_id}")
         return False
@@ -171,29 +507,26 @@ class FileCache:
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         logger.debug("Generating cache statistics")
-        self._cleanup_expired()
+        with self._lock:
+            self._cleanup_expired()
+            snapshot = list(self.cache.values())
         
-        languages = {}
-        file_types = {}
+        languages = Counter()
+        file_types = Counter()
         total_size = 0
         
-        for cached_file in self.cache.values():
-            # Count by language
-            languages[cached_file.language] = languages.get(cached_file.language, 0) + 1
-            
-            # Count by file type
-            file_types[cached_file.file_type] = file_types.get(cached_file.file_type, 0) + 1
-            
-            # Sum total size
+        for cached_file in snapshot:
+            languages[cached_file.language] += 1
+            file_types[cached_file.file_type] += 1
             total_size += cached_file.file_size
         
         stats = {
-            'total_files': len(self.cache),
+            'total_files': len(snapshot),
             'max_files': self.max_files,
             'total_size_bytes': total_size,
             'expiration_hours': self.expiration_hours,
-            'languages': languages,
-            'file_types': file_types
+            'languages': dict(languages),
+            'file_types': dict(file_types)
         }
         
         logger.info(f"Cache stats generated - Files: {stats['total_files']}, Size: {total_size} bytes, Languages: {list(languages.keys())}")
@@ -202,10 +535,20 @@ class FileCache:
     
     def clear_cache(self) -> int:
         """Clear all files from cache and return count of deleted files"""
-        count = len(self.cache)
-        logger.info(f"Clearing cache - {count} files will be deleted")
-        
-        self.cache.clear()
+        with self._lock:
+            count = len(self.cache)
+            logger.info(f"Clearing cache - {count} files will be deleted")
+            
+            for file_id, cached_file in self.cache.items():
+                self._discard(file_id, cached_file)
+            self.cache.clear()
+            self._exp_heap.clear()
+            self._hash_index.clear()
+            self._parse_cache.clear()
+            self._suggestion_cache.clear()
+            self._hash_refs.clear()
+            self._sketch.clear()
+            self._sketch_increments = 0
         
         logger.info(f"Cache cleared successfully - {count} files deleted")
         return count
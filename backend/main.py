@@ -3,6 +3,7 @@ from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import logging
+from typing import Optional
 from services.parsing_service import parse_code_endpoint
 from services.suggestion_service import suggest_refactoring
 from services.cache_service import (
@@ -60,8 +61,8 @@ async def root():
     return {
         "message": "CodeNarrator API is running!",
         "endpoints": {
-            "POST /parse-code/": "Upload code files (.py, .java, .js/.jsx) to generate markdown documentation",
-            "POST /suggest/": "Upload code files (.py, .java, .js/.jsx) to get language-specific refactoring suggestions",
+            "POST /parse-code/": "Upload code files (.py, .java, .js/.jsx) to generate markdown documentation (or pass ?file_id= of a cached upload)",
+            "POST /suggest/": "Upload code files (.py, .java, .js/.jsx) to get language-specific refactoring suggestions (or pass ?file_id= of a cached upload)",
             "GET /files/recent": "Get list of recently uploaded files",
             "GET /files/{file_id}": "Get specific cached file content",
             "GET /files/{file_id}/download": "Download cached file as plain text",
@@ -88,21 +89,28 @@ async def root():
 #     return {"markdown": markdown}
 
 @app.post("/parse-code/")
-async def parse_code_route(file: UploadFile = File(...)):
+async def parse_code_route(
+    file: Optional[UploadFile] = File(None),
+    file_id: Optional[str] = Query(None, description="ID of an already cached upload to use instead of a file")
+):
     """
     Upload a code file and generate markdown documentation.
     Supports Python (.py), Java (.java), and JavaScript (.js/.jsx) files.
     Returns the generated markdown content and file information.
     """
-    return await parse_code_endpoint(file)
+    return await parse_code_endpoint(file, file_id)
 
 @app.post("/suggest/")
-async def suggest_route(file: UploadFile = File(...)):
+async def suggest_route(
+    file: Optional[UploadFile] = File(None),
+    file_id: Optional[str] = Query(None, description="ID of an already cached upload to use instead of a file")
+):
     """
     Upload a code file and get language-specific refactoring suggestions.
     Supports Python (.py), Java (.java), and JavaScript (.js) files.
+    Pass file_id (e.g. the uploaded_file_id from /parse-code/) to reuse a cached upload.
     """
-    return await suggest_refactoring(file)
+    return await suggest_refactoring(file, file_id)
 
 # Cache Management APIs
 
@@ -0,0 +1,35 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable
+
+def cache_by_source(maxsize: int = 256) -> Callable[[Callable[[str], str]], Callable[[str], str]]:
+    """
+    Memoize a source -> markdown renderer in an LRU keyed by a digest of the source.
+    
+    Rendered output depends only on the source text, so identical files are
+    rendered once; keys are 16-byte BLAKE2b digests rather than the sources.
+    """
+    def decorator(render: Callable[[str], str]) -> Callable[[str], str]:
+        cache: "OrderedDict[bytes, str]" = OrderedDict()
+        lock = threading.Lock()
+        
+        @wraps(render)
+        def wrapper(code: str) -> str:
+            digest = hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            with lock:
+                markdown = cache.get(digest)
+                if markdown is not None:
+                    cache.move_to_end(digest)
+                    return markdown
+            
+            markdown = render(code)
+            with lock:
+                cache[digest] = markdown
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return markdown
+        
+        return wrapper
+    return decorator
@@ -1,20 +1,56 @@
 import re
-from typing import List, Dict, Any, Optional
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Tuple
+from parser._render_cache import cache_by_source
+from source_lines import line_start_offsets, line_of
 
+# Patterns are compiled once at import time and shared by every parse. Only the
+# Javadoc pattern needs DOTALL; declarations are matched on their header alone.
+# Javadoc, package and import declarations are found by one fused scan; the
+# match kind is read from lastgroup. Javadoc text is consumed by the scan, so
+# declarations mentioned inside doc comments are not picked up.
+_TOP_LEVEL_RE = re.compile(
+    r'/\*\*(?P<javadoc>(?s:.*?))\*/'
+    r'|^\s*package\s+(?P<package>[\w.]+)\s*;'
+    r'|^\s*(?P<import>import\s+(?:static\s+)?[\w.*]+\s*;)',
+    re.MULTILINE
+)
+_JAVADOC_STAR_RE = re.compile(r'^\s*\*\s?', re.MULTILINE)
+# Type declaration headers; bodies are located by _scan_blocks rather than by regex
+_INTERFACE_HEADER_RE = re.compile(r'(?:\b(public|private|protected)\s+)?(?:(abstract)\s+)?\binterface\s+(\w+)(?:\s*<[^{}]*?>)?(?:\s+extends\s+([\w,\s]+))?\s*$')
+_CLASS_HEADER_RE = re.compile(r'(?:\b(public|private|protected)\s+)?(?:(static|final|abstract)\s+)*\bclass\s+(\w+)(?:\s*<[^{}]*?>)?(?:\s+extends\s+(\w+)(?:\s*<[^{}]*?>)?)?(?:\s+implements\s+([\w,\s]+))?\s*$')
+_ENUM_HEADER_RE = re.compile(r'(?:\b(public|private|protected)\s+)?\benum\s+(\w+)(?:\s+implements\s+([\w,\s]+))?\s*$')
+_TYPE_HEADERS = (
+    ('interface', _INTERFACE_HEADER_RE),
+    ('class', _CLASS_HEADER_RE),
+    ('enum', _ENUM_HEADER_RE),
+)
+_ENUM_CONSTANT_RE = re.compile(r'(\w+)(?:\([^)]*\))?(?:\s*\{[^}]*\})?\s*[,;]?')
+# Type references allow one level of nested type arguments, e.g. Map<String, List<Foo>>
+_TYPE = r'\w+(?:<(?:[^<>]|<[^<>]*>)*>)?(?:\[\])*'
+_FIELD_RE = re.compile(r'(?:(public|private|protected)\s+)?(?:(static|final)\s+)*(' + _TYPE + r')\s+(\w+)(?:\s*=\s*([^;]+))?\s*;')
+_METHOD_RE = re.compile(r'(?:(public|private|protected)\s+)?(?:(static|final|abstract|synchronized)\s+)*(' + _TYPE + r')\s+(\w+)\s*\(([^)]*)\)\s*(?:throws\s+[\w,\s]+)?\s*[{;]')
+_CONSTRUCTOR_RE = re.compile(r'(?:(public|private|protected)\s+)?(\w+)\s*\(([^)]*)\)\s*(?:throws\s+[\w,\s]+)?\s*\{')
+_IFACE_METHOD_RE = re.compile(r'(?:(public|private)\s+)?(?:(static|default)\s+)*(' + _TYPE + r')\s+(\w+)\s*\(([^)]*)\)\s*(?:throws\s+[\w,\s]+)?\s*[;{]')
+_PARAM_MATCH_RE = re.compile(r'(?:(final)\s+)?(' + _TYPE + r')\s+(\w+)')
+
+@cache_by_source()
 def parse_code_to_markdown(code: str) -> str:
     """Parse Java code and generate comprehensive markdown documentation."""
     doc_lines = ["# Java Code Documentation\n"]
     
-    # Extract Javadoc comments
-    javadoc_comments = _extract_javadoc_comments(code)
+    # Offset -> line lookups share one index instead of re-counting prefixes
+    line_starts = line_start_offsets(code)
+    
+    # Javadoc, package and imports come from a single pass over the source
+    javadoc_comments, package, imports = _scan_top_level(code, line_starts)
+    
+    # Locate every brace-delimited block once and sort type declarations by kind
+    type_blocks = _group_type_blocks(code, _scan_blocks(code))
     
-    # Parse package declaration
-    package = _extract_package(code)
     if package:
         doc_lines.append(f"## Package: `{package}`\n")
     
-    # Parse imports
-    imports = _extract_imports(code)
     if imports:
         doc_lines.append("## Imports")
         for imp in imports:
@@ -22,71 +58,151 @@ def parse_code_to_markdown(code: str) -> str:
         doc_lines.append("")
     
     # Parse interfaces
-    interfaces = _extract_interfaces(code, javadoc_comments)
+    interfaces = _extract_interfaces(type_blocks['interface'], line_starts, javadoc_comments)
     if interfaces:
         doc_lines.append("## Interfaces")
         for interface in interfaces:
-            doc_lines.extend(_format_interface(interface))
+            _format_interface(interface, doc_lines)
     
     # Parse classes
-    classes = _extract_classes(code, javadoc_comments)
+    classes = _extract_classes(type_blocks['class'], line_starts, javadoc_comments)
     if classes:
         doc_lines.append("## Classes")
         for cls in classes:
-            doc_lines.extend(_format_class(cls))
+            _format_class(cls, doc_lines)
     
     # Parse enums
-    enums = _extract_enums(code, javadoc_comments)
+    enums = _extract_enums(type_blocks['enum'], line_starts, javadoc_comments)
     if enums:
         doc_lines.append("## Enums")
         for enum in enums:
-            doc_lines.extend(_format_enum(enum))
+            _format_enum(enum, doc_lines)
     
     return "\n".join(doc_lines)
 
-def _extract_javadoc_comments(code: str) -> Dict[int, str]:
-    """Extract Javadoc comments and map them to line numbers."""
-    javadoc_pattern = r'/\*\*(.*?)\*/'
+def _scan_top_level(code: str, line_starts: List[int]) -> Tuple[Dict[int, str], Optional[str], List[str]]:
+    """Collect Javadoc comments, the package name and imports in one pass."""
     javadoc_comments = {}
-    
-    for match in re.finditer(javadoc_pattern, code, re.DOTALL):
-        line_num = code[:match.start()].count('\n')
-        # Clean up the javadoc content
-        content = match.group(1)
-        content = re.sub(r'^\s*\*\s?', '', content, flags=re.MULTILINE)
-        javadoc_comments[line_num] = content.strip()
-    
-    return javadoc_comments
+    package = None
+    imports = []
+    
+    for match in _TOP_LEVEL_RE.finditer(code):
+        kind = match.lastgroup
+        if kind == 'javadoc':
+            line_num = line_of(line_starts, match.start())
+            # Clean up the javadoc content
+            content = _JAVADOC_STAR_RE.sub('', match.group('javadoc'))
+            javadoc_comments[line_num] = content.strip()
+        elif kind == 'import':
+            imports.append(match.group('import'))
+        elif package is None:
+            package = match.group('package')
+    
+    return javadoc_comments, package, imports
 
-def _extract_package(code: str) -> Optional[str]:
-    """Extract package declaration."""
-    package_pattern = r'package\s+([\w.]+)\s*;'
-    match = re.search(package_pattern, code)
-    return match.group(1) if match else None
+def _scan_blocks(code: str) -> List[Tuple[int, int, int, int]]:
+    """
+    Match braces in a single pass over the source.
+    
+    Returns (header_start, body_start, body_end, depth) for every block in
+    source order, where body_start/body_end are the offsets of the braces and
+    header_start is just past the previous ';', '{' or '}'. Braces inside
+    comments and string/char literals are ignored.
+    """
+    blocks = []
+    open_stack = []
+    segment_start = 0
+    i = 0
+    n = len(code)
+    
+    while i < n:
+        char = code[i]
+        if char == '/' and code.startswith('//', i):
+            end = code.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if char == '/' and code.startswith('/*', i):
+            end = code.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        if char == '"' and code.startswith('"""', i):
+            end = code.find('"""', i + 3)
+            i = n if end == -1 else end + 3
+            continue
+        if char == '"' or char == "'":
+            i += 1
+            while i < n and code[i] != char and code[i] != '\n':
+                i += 2 if code[i] == '\\' else 1
+            i += 1
+            continue
+        if char == '{':
+            open_stack.append((segment_start, i))
+            segment_start = i + 1
+        elif char == '}':
+            if open_stack:
+                header_start, body_start = open_stack.pop()
+                blocks.append((header_start, body_start, i, len(open_stack)))
+            segment_start = i + 1
+        elif char == ';':
+            segment_start = i + 1
+        i += 1
+    
+    # Unterminated blocks run to the end of the source
+    while open_stack:
+        header_start, body_start = open_stack.pop()
+        blocks.append((header_start, body_start, n, len(open_stack)))
+    
+    blocks.sort(key=lambda block: block[1])
+    return blocks
 
-def _extract_imports(code: str) -> List[str]:
-    """Extract import statements."""
-    import_pattern = r'import\s+(?:static\s+)?([\w.*]+)\s*;'
-    matches = re.finditer(import_pattern, code)
-    return [match.group(0).strip() for match in matches]
+def _group_type_blocks(code: str,
+                       blocks: List[Tuple[int, int, int, int]]) -> Dict[str, List[Tuple[re.Match, int, str]]]:
+    """
+    Sort blocks into interface/class/enum declarations in a single pass.
+    
+    Each entry is (header match, declaration offset, member text), where the
+    member text is the block body with nested block contents (method bodies,
+    initializers, inner types) collapsed to '{}'.
+    """
+    grouped = {kind: [] for kind, _ in _TYPE_HEADERS}
+    body_starts = [block[1] for block in blocks]
+    
+    for index, (header_start, body_start, body_end, depth) in enumerate(blocks):
+        for kind, header_re in _TYPE_HEADERS:
+            match = header_re.search(code, header_start, body_start)
+            if match:
+                break
+        else:
+            continue
+        
+        parts = []
+        cursor = body_start + 1
+        child = index + 1
+        last_child = bisect_left(body_starts, body_end, lo=child)
+        while child < last_child:
+            _, child_start, child_end, child_depth = blocks[child]
+            if child_depth == depth + 1:
+                parts.append(code[cursor:child_start + 1])
+                cursor = child_end
+            child += 1
+        parts.append(code[cursor:body_end])
+        
+        grouped[kind].append((match, match.start(), ''.join(parts)))
+    
+    return grouped
 
-def _extract_interfaces(code: str, javadoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
+def _extract_interfaces(type_blocks: List[Tuple[re.Match, int, str]],
+                        line_starts: List[int], javadoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
     """Extract interface definitions."""
     interfaces = []
     
-    # Interface pattern with optional extends
-    interface_pattern = r'(?:(public|private|protected)\s+)?(?:(abstract)\s+)?interface\s+(\w+)(?:\s+extends\s+([\w,\s]+))?\s*\{([^}]*(?:\{[^}]*\}[^}]*)*)\}'
-    
-    matches = re.finditer(interface_pattern, code, re.DOTALL)
-    
-    for match in matches:
+    for match, offset, interface_body in type_blocks:
         access_modifier = match.group(1)
         # abstract_modifier = match.group(2)
         interface_name = match.group(3)
         extends_clause = match.group(4)
-        interface_body = match.group(5)
         
-        line_num = code[:match.start()].count('\n')
+        line_num = line_of(line_starts, offset)
         interface_doc = _find_javadoc_for_line(javadoc_comments, line_num)
         
         interface_info = {
@@ -101,24 +217,19 @@ def _extract_interfaces(code: str, javadoc_comments: Dict[int, str]) -> List[Dic
     
     return interfaces
 
-def _extract_classes(code: str, javadoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
+def _extract_classes(type_blocks: List[Tuple[re.Match, int, str]],
+                     line_starts: List[int], javadoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
     """Extract class definitions."""
     classes = []
     
-    # Class pattern with optional modifiers, extends, implements
-    class_pattern = r'(?:(public|private|protected)\s+)?(?:(static|final|abstract)\s+)*class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([\w,\s]+))?\s*\{([^}]*(?:\{[^}]*\}[^}]*)*)\}'
-    
-    matches = re.finditer(class_pattern, code, re.DOTALL)
-    
-    for match in matches:
+    for match, offset, class_body in type_blocks:
         access_modifier = match.group(1)
         other_modifiers = match.group(2)
         class_name = match.group(3)
         extends_clause = match.group(4)
         implements_clause = match.group(5)
-        class_body = match.group(6)
         
-        line_num = code[:match.start()].count('\n')
+        line_num = line_of(line_starts, offset)
         class_doc = _find_javadoc_for_line(javadoc_comments, line_num)
         
         class_info = {
@@ -137,28 +248,22 @@ def _extract_classes(code: str, javadoc_comments: Dict[int, str]) -> List[Dict[s
     
     return classes
 
-def _extract_enums(code: str, javadoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
+def _extract_enums(type_blocks: List[Tuple[re.Match, int, str]],
+                   line_starts: List[int], javadoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
     """Extract enum definitions."""
     enums = []
     
-    enum_pattern = r'(?:(public|private|protected)\s+)?enum\s+(\w+)(?:\s+implements\s+([\w,\s]+))?\s*\{([^}]*)\}'
-    
-    matches = re.finditer(enum_pattern, code, re.DOTALL)
-    
-    for match in matches:
+    for match, offset, enum_body in type_blocks:
         access_modifier = match.group(1)
         enum_name = match.group(2)
         implements_clause = match.group(3)
-        enum_body = match.group(4)
         
-        line_num = code[:match.start()].count('\n')
+        line_num = line_of(line_starts, offset)
         enum_doc = _find_javadoc_for_line(javadoc_comments, line_num)
         
-        # Extract enum constants
+        # Extract enum constants (the constant list ends at the first ';')
         constants = []
-        # Simple enum constant pattern
-        constant_pattern = r'(\w+)(?:\([^)]*\))?(?:\s*\{[^}]*\})?\s*[,;]?'
-        for constant_match in re.finditer(constant_pattern, enum_body):
+        for constant_match in _ENUM_CONSTANT_RE.finditer(enum_body.split(';', 1)[0]):
             constant_name = constant_match.group(1)
             if constant_name.isupper() or constant_name[0].isupper():
                 constants.append(constant_name)
@@ -179,12 +284,7 @@ def _extract_fields(class_body: str) -> List[Dict[str, Any]]:
     """Extract field declarations from class body."""
     fields = []
     
-    # Field pattern: modifiers type name = value;
-    field_pattern = r'(?:(public|private|protected)\s+)?(?:(static|final)\s+)*(\w+(?:<[^>]+>)?(?:\[\])*)\s+(\w+)(?:\s*=\s*([^;]+))?\s*;'
-    
-    matches = re.finditer(field_pattern, class_body)
-    
-    for match in matches:
+    for match in _FIELD_RE.finditer(class_body):
         access_modifier = match.group(1)
         modifiers = match.group(2)
         field_type = match.group(3)
@@ -211,14 +311,11 @@ def _extract_constructors(class_body: str, class_name: str) -> List[Dict[str, An
     """Extract constructor definitions."""
     constructors = []
     
-    # Constructor pattern
-    constructor_pattern = rf'(?:(public|private|protected)\s+)?{class_name}\s*\(([^)]*)\)\s*(?:throws\s+[\w,\s]+)?\s*\{{'
-    
-    matches = re.finditer(constructor_pattern, class_body)
-    
-    for match in matches:
+    for match in _CONSTRUCTOR_RE.finditer(class_body):
+        if match.group(2) != class_name:
+            continue
         access_modifier = match.group(1)
-        parameters = match.group(2)
+        parameters = match.group(3)
         
         constructor_info = {
             'access_modifier': access_modifier,
@@ -233,12 +330,7 @@ def _extract_methods(class_body: str) -> List[Dict[str, Any]]:
     """Extract method definitions."""
     methods = []
     
-    # Method pattern
-    method_pattern = r'(?:(public|private|protected)\s+)?(?:(static|final|abstract|synchronized)\s+)*(\w+(?:<[^>]+>)?(?:\[\])*)\s+(\w+)\s*\(([^)]*)\)\s*(?:throws\s+[\w,\s]+)?\s*[{;]'
-    
-    matches = re.finditer(method_pattern, class_body)
-    
-    for match in matches:
+    for match in _METHOD_RE.finditer(class_body):
         access_modifier = match.group(1)
         modifiers = match.group(2)
         return_type = match.group(3)
@@ -265,12 +357,8 @@ def _extract_interface_methods(interface_body: str) -> List[Dict[str, Any]]:
     """Extract method declarations from interface."""
     methods = []
     
-    # Interface method pattern (no body, just declaration)
-    method_pattern = r'(?:(public|private)\s+)?(?:(static|default)\s+)*(\w+(?:<[^>]+>)?(?:\[\])*)\s+(\w+)\s*\(([^)]*)\)\s*(?:throws\s+[\w,\s]+)?\s*[;{]'
-    
-    matches = re.finditer(method_pattern, interface_body)
-    
-    for match in matches:
+    # Interface methods have no body, just a declaration
+    for match in _IFACE_METHOD_RE.finditer(interface_body):
         access_modifier = match.group(1) or 'public'  # Interface methods are public by default
         modifiers = match.group(2)
         return_type = match.group(3)
@@ -296,7 +384,7 @@ def _extract_method_parameters(parameters: str) -> List[Dict[str, Any]]:
     
     param_list = []
     # Split by comma, but be careful of generics
-    param_parts = re.split(r',(?![^<]*>)', parameters)
+    param_parts = _split_parameters(parameters)
     
     for param in param_parts:
         param = param.strip()
@@ -304,7 +392,7 @@ def _extract_method_parameters(parameters: str) -> List[Dict[str, Any]]:
             continue
         
         # Extract parameter type and name
-        param_match = re.match(r'(?:(final)\s+)?(\w+(?:<[^>]+>)?(?:\[\])*)\s+(\w+)', param)
+        param_match = _PARAM_MATCH_RE.match(param)
         if param_match:
             is_final = param_match.group(1) is not None
             param_type = param_match.group(2)
@@ -320,6 +408,22 @@ def _extract_method_parameters(parameters: str) -> List[Dict[str, Any]]:
     
     return param_list
 
+def _split_parameters(parameters: str) -> List[str]:
+    """Split a parameter list on commas that are not inside type arguments."""
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(parameters):
+        if char == '<':
+            depth += 1
+        elif char == '>':
+            depth = max(depth - 1, 0)
+        elif char == ',' and depth == 0:
+            parts.append(parameters[start:i])
+            start = i + 1
+    parts.append(parameters[start:])
+    return parts
+
 def _find_javadoc_for_line(javadoc_comments: Dict[int, str], line_num: int) -> Optional[str]:
     """Find Javadoc comment that precedes the given line."""
     # Look for Javadoc in the few lines before
@@ -328,111 +432,107 @@ def _find_javadoc_for_line(javadoc_comments: Dict[int, str], line_num: int) -> O
             return javadoc_comments[i]
     return None
 
-def _format_interface(interface: Dict[str, Any]) -> List[str]:
-    """Format interface information as markdown."""
-    lines = [f"### Interface: `{interface['name']}`"]
+def _format_interface(interface: Dict[str, Any], out: List[str]) -> None:
+    """Append interface information as markdown to out."""
+    out.append(f"### Interface: `{interface['name']}`")
     
     if interface['access_modifier']:
-        lines.append(f"**Access:** {interface['access_modifier']}")
+        out.append(f"**Access:** {interface['access_modifier']}")
     
     if interface['extends']:
-        lines.append(f"**Extends:** {', '.join(f'`{ext}`' for ext in interface['extends'])}")
+        out.append(f"**Extends:** {', '.join(f'`{ext}`' for ext in interface['extends'])}")
     
     if interface['docstring']:
-        lines.append(f"**Description:** {interface['docstring']}")
+        out.append(f"**Description:** {interface['docstring']}")
     
     if interface['methods']:
-        lines.append("**Methods:**")
+        out.append("**Methods:**")
         for method in interface['methods']:
-            lines.extend(_format_method(method, is_interface=True))
+            _format_method(method, out, is_interface=True)
     
-    lines.append("")
-    return lines
+    out.append("")
 
-def _format_class(cls: Dict[str, Any]) -> List[str]:
-    """Format class information as markdown."""
-    lines = [f"### Class: `{cls['name']}`"]
+def _format_class(cls: Dict[str, Any], out: List[str]) -> None:
+    """Append class information as markdown to out."""
+    out.append(f"### Class: `{cls['name']}`")
     
     if cls['access_modifier']:
-        lines.append(f"**Access:** {cls['access_modifier']}")
+        out.append(f"**Access:** {cls['access_modifier']}")
     
     if cls['modifiers']:
-        lines.append(f"**Modifiers:** {', '.join(cls['modifiers'])}")
+        out.append(f"**Modifiers:** {', '.join(cls['modifiers'])}")
     
     if cls['extends']:
-        lines.append(f"**Extends:** `{cls['extends']}`")
+        out.append(f"**Extends:** `{cls['extends']}`")
     
     if cls['implements']:
-        lines.append(f"**Implements:** {', '.join(f'`{impl}`' for impl in cls['implements'])}")
+        out.append(f"**Implements:** {', '.join(f'`{impl}`' for impl in cls['implements'])}")
     
     if cls['docstring']:
-        lines.append(f"**Description:** {cls['docstring']}")
+        out.append(f"**Description:** {cls['docstring']}")
     
     if cls['fields']:
-        lines.append("**Fields:**")
+        out.append("**Fields:**")
         for field in cls['fields']:
             modifiers_str = ' '.join(field['modifiers']) + ' ' if field['modifiers'] else ''
             access_str = field['access_modifier'] + ' ' if field['access_modifier'] else ''
             value_str = f" = `{field['initial_value']}`" if field['initial_value'] else ""
-            lines.append(f"- {access_str}{modifiers_str}`{field['name']}`: {field['type']}{value_str}")
+            out.append(f"- {access_str}{modifiers_str}`{field['name']}`: {field['type']}{value_str}")
     
     if cls['constructors']:
-        lines.append("**Constructors:**")
+        out.append("**Constructors:**")
         for i, constructor in enumerate(cls['constructors']):
             access_str = constructor['access_modifier'] + ' ' if constructor['access_modifier'] else ''
-            lines.append(f"#### Constructor {i+1}: {access_str}`{cls['name']}`")
+            out.append(f"#### Constructor {i+1}: {access_str}`{cls['name']}`")
             if constructor['parameters']:
-                lines.append("**Parameters:**")
+                out.append("**Parameters:**")
                 for param in constructor['parameters']:
                     final_str = 'final ' if param.get('is_final', False) else ''
-                    lines.append(f"- {final_str}`{param['name']}`: {param['type']}")
-            lines.append("")
+                    out.append(f"- {final_str}`{param['name']}`: {param['type']}")
+            out.append("")
     
     if cls['methods']:
-        lines.append("**Methods:**")
+        out.append("**Methods:**")
         for method in cls['methods']:
-            lines.extend(_format_method(method))
+            _format_method(method, out)
     
-    lines.append("")
-    return lines
+    out.append("")
 
-def _format_enum(enum: Dict[str, Any]) -> List[str]:
-    """Format enum information as markdown."""
-    lines = [f"### Enum: `{enum['name']}`"]
+def _format_enum(enum: Dict[str, Any], out: List[str]) -> None:
+    """Append enum information as markdown to out."""
+    out.append(f"### Enum: `{enum['name']}`")
     
     if enum['access_modifier']:
-        lines.append(f"**Access:** {enum['access_modifier']}")
+        out.append(f"**Access:** {enum['access_modifier']}")
     
     if enum['implements']:
-        lines.append(f"**Implements:** {', '.join(f'`{impl}`' for impl in enum['implements'])}")
+        out.append(f"**Implements:** {', '.join(f'`{impl}`' for impl in enum['implements'])}")
     
     if enum['docstring']:
-        lines.append(f"**Description:** {enum['docstring']}")
+        out.append(f"**Description:** {enum['docstring']}")
     
     if enum['constants']:
-        lines.append("**Constants:**")
+        out.append("**Constants:**")
         for constant in enum['constants']:
-            lines.append(f"- `{constant}`")
+            out.append(f"- `{constant}`")
     
-    lines.append("")
-    return lines
+    out.append("")
 
-def _format_method(method: Dict[str, Any], is_interface: bool = False) -> List[str]:
-    """Format method information as markdown."""
+def _format_method(method: Dict[str, Any], out: List[str], is_interface: bool = False) -> None:
+    """Append method information as markdown to out."""
     prefix = "####" 
     modifiers_str = ' '.join(method['modifiers']) + ' ' if method['modifiers'] else ''
     access_str = method['access_modifier'] + ' ' if method['access_modifier'] else ''
     
-    lines = [f"{prefix} Method: {access_str}{modifiers_str}`{method['name']}`"]
+    out.append(f"{prefix} Method: {access_str}{modifiers_str}`{method['name']}`")
     
     if not is_interface:
-        lines.append(f"**Returns:** `{method['return_type']}`")
+        out.append(f"**Returns:** `{method['return_type']}`")
     
     if method['parameters']:
-        lines.append("**Parameters:**")
+        out.append("**Parameters:**")
         for param in method['parameters']:
             final_str = 'final ' if param.get('is_final', False) else ''
-            lines.append(f"- {final_str}`{param['name']}`: {param['type']}")
+            out.append(f"- {final_str}`{param['name']}`: {param['type']}")
     
-    lines.append("")
-    return lines
+    out.append("")
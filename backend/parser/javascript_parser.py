@@ -1,12 +1,58 @@
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+from parser._render_cache import cache_by_source
+from source_lines import line_start_offsets, line_of
 
+# Patterns are compiled once at import time and shared by every parse
+_JSDOC_RE = re.compile(r'/\*\*(.*?)\*/', re.DOTALL)
+_IMPORT_RES = [
+    re.compile(r'import\s+\{([^}]+)\}\s+from\s+[\'"]([^\'"]+)[\'"]'),  # Named imports
+    re.compile(r'import\s+([^,\s]+)\s+from\s+[\'"]([^\'"]+)[\'"]'),     # Default imports
+    re.compile(r'import\s+\*\s+as\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'),  # Namespace imports
+    re.compile(r'import\s+[\'"]([^\'"]+)[\'"]'),                        # Side effect imports
+]
+# CommonJS requires; reported in a normalised "const x = require('m')" form
+_REQUIRE_RES = [
+    re.compile(r'const\s+\{([^}]+)\}\s*=\s*require\([\'"]([^\'"]+)[\'"]\)'),  # CommonJS destructuring
+    re.compile(r'const\s+(\w+)\s*=\s*require\([\'"]([^\'"]+)[\'"]\)'),  # CommonJS require
+]
+_EXPORT_RES = [
+    re.compile(r'export\s+default\s+\w+'),
+    re.compile(r'export\s+\{([^}]+)\}'),
+    re.compile(r'export\s+(?:const|let|var|function|class)\s+(\w+)'),
+    re.compile(r'module\.exports\s*=\s*([^;]+)'),
+]
+_VARIABLE_RE = re.compile(r'(const|let|var)\s+(\w+)\s*=\s*([^;,\n]+)')
+# Class and method patterns match only the header up to the opening brace; the
+# body is found by brace balancing, which avoids nested-quantifier backtracking
+_CLASS_HEAD_RE = re.compile(r'class\s+(\w+)(?:\s+extends\s+(\w+))?\s*\{')
+# Method heads may be async, accessors, generators or #private, and parameter
+# defaults may contain one level of parentheses, e.g. `ac = new AbortController()`
+_METHOD_HEAD_RE = re.compile(
+    r'(?<![\w$#])(?:(static)\s+)?(?:(?:async|get|set)\s+)?(?:\*\s*)?(#?[\w$]+)\s*'
+    r'\((?:[^()]|\([^()]*\))*\)\s*\{'
+)
+# Control-flow heads look like method heads; their blocks are skipped, not reported
+_NON_METHOD_KEYWORDS = frozenset(('if', 'for', 'while', 'switch', 'catch', 'with', 'function', 'return'))
+_CONSTRUCTOR_RE = re.compile(r'constructor\s*\(([^)]*)\)\s*\{')
+_FUNCTION_RES = [
+    re.compile(r'function\s+(\w+)\s*\(([^)]*)\)\s*\{'),  # Regular functions
+    re.compile(r'const\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>\s*[{(]'),  # Arrow functions assigned to const
+    re.compile(r'(?:let|var)\s+(\w+)\s*=\s*(?:async\s+)?function[^{]*\{'),  # Function expressions
+]
+_PARAMS_RE = re.compile(r'\(([^)]*)\)')
+_PARAM_NAME_RE = re.compile(r'(\w+)')
+
+@cache_by_source()
 def parse_code_to_markdown(code: str) -> str:
     """Parse JavaScript code and generate comprehensive markdown documentation."""
     doc_lines = ["# JavaScript Code Documentation\n"]
     
+    # Offset -> line lookups share one index instead of re-counting prefixes
+    line_starts = line_start_offsets(code)
+    
     # Remove comments for parsing (but keep JSDoc)
-    cleaned_code, jsdoc_comments = _extract_jsdoc_comments(code)
+    cleaned_code, jsdoc_comments = _extract_jsdoc_comments(code, line_starts)
     
     # Parse imports
     imports = _extract_imports(code)
@@ -33,75 +79,53 @@ def parse_code_to_markdown(code: str) -> str:
         doc_lines.append("")
     
     # Parse classes
-    classes = _extract_classes(code, jsdoc_comments)
+    classes = _extract_classes(code, line_starts, jsdoc_comments)
     if classes:
         doc_lines.append("## Classes")
         for cls in classes:
-            doc_lines.extend(_format_class(cls))
+            _format_class(cls, doc_lines)
     
     # Parse standalone functions
-    functions = _extract_functions(code, jsdoc_comments)
+    functions = _extract_functions(code, line_starts, jsdoc_comments)
     if functions:
         doc_lines.append("## Functions")
         for func in functions:
-            doc_lines.extend(_format_function(func))
+            _format_function(func, doc_lines)
     
     return "\n".join(doc_lines)
 
-def _extract_jsdoc_comments(code: str) -> tuple[str, Dict[int, str]]:
+def _extract_jsdoc_comments(code: str, line_starts: List[int]) -> tuple[str, Dict[int, str]]:
     """Extract JSDoc comments and return cleaned code with JSDoc mapping."""
-    jsdoc_pattern = r'/\*\*(.*?)\*/'
     jsdoc_comments = {}
     
     def replace_jsdoc(match):
-        line_num = code[:match.start()].count('\n')
+        line_num = line_of(line_starts, match.start())
         jsdoc_comments[line_num] = match.group(1).strip()
         return ''
     
-    cleaned_code = re.sub(jsdoc_pattern, replace_jsdoc, code, flags=re.DOTALL)
+    cleaned_code = _JSDOC_RE.sub(replace_jsdoc, code)
     return cleaned_code, jsdoc_comments
 
 def _extract_imports(code: str) -> List[str]:
-    """Extract import statements."""
-    imports = []
-    
-    # ES6 imports
-    import_patterns = [
-        r'import\s+\{([^}]+)\}\s+from\s+[\'"]([^\'"]+)[\'"]',  # Named imports
-        r'import\s+([^,\s]+)\s+from\s+[\'"]([^\'"]+)[\'"]',     # Default imports
-        r'import\s+\*\s+as\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]',  # Namespace imports
-        r'import\s+[\'"]([^\'"]+)[\'"]',                        # Side effect imports
-        r'const\s+\{([^}]+)\}\s*=\s*require\([\'"]([^\'"]+)[\'"]\)',  # CommonJS destructuring
-        r'const\s+(\w+)\s*=\s*require\([\'"]([^\'"]+)[\'"]\)',  # CommonJS require
-    ]
-    
-    for pattern in import_patterns:
-        matches = re.finditer(pattern, code)
-        for match in matches:
-            if len(match.groups()) == 2:
-                if 'require' in match.group(0):
-                    imports.append(f"const {match.group(1)} = require('{match.group(2)}')")
-                else:
-                    imports.append(match.group(0).strip())
-            else:
-                imports.append(match.group(0).strip())
-    
-    return imports
+    """Extract import statements, dropping duplicates but keeping first-seen order."""
+    imports = {}
+    
+    for pattern in _IMPORT_RES:
+        for match in pattern.finditer(code):
+            imports[match.group(0).strip()] = None
+    
+    for pattern in _REQUIRE_RES:
+        for match in pattern.finditer(code):
+            imports[f"const {match.group(1)} = require('{match.group(2)}')"] = None
+    
+    return list(imports)
 
 def _extract_exports(code: str) -> List[str]:
     """Extract export statements."""
     exports = []
     
-    export_patterns = [
-        r'export\s+default\s+\w+',
-        r'export\s+\{([^}]+)\}',
-        r'export\s+(?:const|let|var|function|class)\s+(\w+)',
-        r'module\.exports\s*=\s*([^;]+)',
-    ]
-    
-    for pattern in export_patterns:
-        matches = re.finditer(pattern, code)
-        for match in matches:
+    for pattern in _EXPORT_RES:
+        for match in pattern.finditer(code):
             exports.append(match.group(0).strip())
     
     return exports
@@ -111,10 +135,7 @@ def _extract_variables(code: str) -> List[Dict[str, Any]]:
     variables = []
     
     # Match const, let, var declarations
-    var_pattern = r'(const|let|var)\s+(\w+)\s*=\s*([^;,\n]+)'
-    matches = re.finditer(var_pattern, code)
-    
-    for match in matches:
+    for match in _VARIABLE_RE.finditer(code):
         var_type, name, value = match.groups()
         variables.append({
             'name': name,
@@ -124,21 +145,17 @@ def _extract_variables(code: str) -> List[Dict[str, Any]]:
     
     return variables
 
-def _extract_classes(code: str, jsdoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
+def _extract_classes(code: str, line_starts: List[int], jsdoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
     """Extract class definitions."""
     classes = []
     
-    # Class pattern
-    class_pattern = r'class\s+(\w+)(?:\s+extends\s+(\w+))?\s*\{([^}]*(?:\{[^}]*\}[^}]*)*)\}'
-    matches = re.finditer(class_pattern, code, re.DOTALL)
-    
-    for match in matches:
+    for match, body_end in _iter_blocks(_CLASS_HEAD_RE, code):
         class_name = match.group(1)
         parent_class = match.group(2)
-        class_body = match.group(3)
+        class_body = code[match.end():body_end - 1]
         
         # Find JSDoc for this class
-        line_num = code[:match.start()].count('\n')
+        line_num = line_of(line_starts, match.start())
         class_doc = _find_jsdoc_for_line(jsdoc_comments, line_num)
         
         class_info = {
@@ -150,15 +167,12 @@ def _extract_classes(code: str, jsdoc_comments: Dict[int, str]) -> List[Dict[str
         }
         
         # Extract methods from class body
-        method_pattern = r'(?:(static)\s+)?(\w+)\s*\([^)]*\)\s*\{[^}]*(?:\{[^}]*\}[^}]*)*\}'
-        method_matches = re.finditer(method_pattern, class_body, re.DOTALL)
-        
-        for method_match in method_matches:
+        for method_match, _ in _iter_blocks(_METHOD_HEAD_RE, class_body):
             is_static = method_match.group(1) is not None
             method_name = method_match.group(2)
             
             # Skip constructor in methods list, handle separately
-            if method_name == 'constructor':
+            if method_name == 'constructor' or method_name in _NON_METHOD_KEYWORDS:
                 continue
                 
             method_info = {
@@ -170,8 +184,7 @@ def _extract_classes(code: str, jsdoc_comments: Dict[int, str]) -> List[Dict[str
             class_info['methods'].append(method_info)
         
         # Extract constructor
-        constructor_pattern = r'constructor\s*\(([^)]*)\)\s*\{'
-        constructor_match = re.search(constructor_pattern, class_body)
+        constructor_match = _CONSTRUCTOR_RE.search(class_body)
         if constructor_match:
             class_info['constructor'] = {
                 'parameters': _extract_function_params(constructor_match.group(0))
@@ -181,22 +194,50 @@ def _extract_classes(code: str, jsdoc_comments: Dict[int, str]) -> List[Dict[str
     
     return classes
 
-def _extract_functions(code: str, jsdoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
+def _iter_blocks(head_re: re.Pattern, code: str) -> Iterator[Tuple[re.Match, int]]:
+    """
+    Yield (header match, end offset) for each braced block introduced by head_re.
+    
+    Scanning resumes after each block, so nested blocks are not reported.
+    Headers whose braces never balance are skipped.
+    """
+    pos = 0
+    while True:
+        match = head_re.search(code, pos)
+        if not match:
+            return
+        end = _find_block_end(code, match.end() - 1)
+        if end == -1:
+            pos = match.end()
+            continue
+        yield match, end
+        pos = end
+
+def _find_block_end(code: str, open_pos: int) -> int:
+    """Return the offset just past the brace closing the one at open_pos, or -1."""
+    depth = 1
+    pos = open_pos + 1
+    while depth:
+        close = code.find('}', pos)
+        if close == -1:
+            return -1
+        opened = code.find('{', pos, close)
+        if opened == -1:
+            depth -= 1
+            pos = close + 1
+        else:
+            depth += 1
+            pos = opened + 1
+    return pos
+
+def _extract_functions(code: str, line_starts: List[int], jsdoc_comments: Dict[int, str]) -> List[Dict[str, Any]]:
     """Extract function definitions."""
     functions = []
     
-    # Function patterns
-    patterns = [
-        r'function\s+(\w+)\s*\(([^)]*)\)\s*\{',  # Regular functions
-        r'const\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>\s*[{(]',  # Arrow functions assigned to const
-        r'(?:let|var)\s+(\w+)\s*=\s*(?:async\s+)?function[^{]*\{',  # Function expressions
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, code)
-        for match in matches:
+    for pattern in _FUNCTION_RES:
+        for match in pattern.finditer(code):
             func_name = match.group(1)
-            line_num = code[:match.start()].count('\n')
+            line_num = line_of(line_starts, match.start())
             func_doc = _find_jsdoc_for_line(jsdoc_comments, line_num)
             
             # Extract full function for parameter analysis
@@ -215,32 +256,23 @@ def _extract_functions(code: str, jsdoc_comments: Dict[int, str]) -> List[Dict[s
 
 def _extract_full_function(code: str, start_pos: int) -> str:
     """Extract the full function definition starting from start_pos."""
-    brace_count = 0
-    paren_count = 0
-    in_function = False
-    
-    for i, char in enumerate(code[start_pos:], start_pos):
-        if char == '{':
-            brace_count += 1
-            in_function = True
-        elif char == '}':
-            brace_count -= 1
-            if in_function and brace_count == 0:
-                return code[start_pos:i+1]
-    
-    # For arrow functions without braces
+    open_pos = code.find('{', start_pos)
+    if open_pos != -1:
+        end = _find_block_end(code, open_pos)
+        if end != -1:
+            return code[start_pos:end]
+    
+    # For arrow functions without braces, stop at the end of the statement
     if '=>' in code[start_pos:start_pos+100]:
-        # Find the end of the arrow function
-        for i, char in enumerate(code[start_pos:], start_pos):
-            if char in [';', '\n'] and paren_count == 0:
-                return code[start_pos:i]
+        ends = [pos for pos in (code.find(';', start_pos), code.find('\n', start_pos)) if pos != -1]
+        if ends:
+            return code[start_pos:min(ends)]
     
     return code[start_pos:start_pos+200]  # Fallback
 
 def _extract_function_params(func_def: str) -> List[Dict[str, Any]]:
     """Extract function parameters."""
-    param_pattern = r'\(([^)]*)\)'
-    match = re.search(param_pattern, func_def)
+    match = _PARAMS_RE.search(func_def)
     if not match:
         return []
     
@@ -250,7 +282,7 @@ def _extract_function_params(func_def: str) -> List[Dict[str, Any]]:
     
     parameters = []
     # Split by comma, but be careful of destructuring
-    param_parts = re.split(r',(?![^{[]*[}\]])', params_str)
+    param_parts = _split_parameters(params_str)
     
     for param in param_parts:
         param = param.strip()
@@ -270,7 +302,7 @@ def _extract_function_params(func_def: str) -> List[Dict[str, Any]]:
         if name.startswith('{') or name.startswith('['):
             param_name = name  # Keep destructuring syntax
         else:
-            param_name = re.match(r'(\w+)', name)
+            param_name = _PARAM_NAME_RE.match(name)
             param_name = param_name.group(1) if param_name else name
         
         parameters.append({
@@ -281,6 +313,22 @@ def _extract_function_params(func_def: str) -> List[Dict[str, Any]]:
     
     return parameters
 
+def _split_parameters(params_str: str) -> List[str]:
+    """Split a parameter list on commas outside destructuring patterns."""
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(params_str):
+        if char == '{' or char == '[':
+            depth += 1
+        elif char == '}' or char == ']':
+            depth = max(depth - 1, 0)
+        elif char == ',' and depth == 0:
+            parts.append(params_str[start:i])
+            start = i + 1
+    parts.append(params_str[start:])
+    return parts
+
 def _find_jsdoc_for_line(jsdoc_comments: Dict[int, str], line_num: int) -> Optional[str]:
     """Find JSDoc comment that precedes the given line."""
     # Look for JSDoc in the few lines before
@@ -289,64 +337,62 @@ def _find_jsdoc_for_line(jsdoc_comments: Dict[int, str], line_num: int) -> Optio
             return jsdoc_comments[i]
     return None
 
-def _format_class(cls: Dict[str, Any]) -> List[str]:
-    """Format class information as markdown."""
-    lines = [f"### Class: `{cls['name']}`"]
+def _format_class(cls: Dict[str, Any], out: List[str]) -> None:
+    """Append class information as markdown to out."""
+    out.append(f"### Class: `{cls['name']}`")
     
     if cls['parent']:
-        lines.append(f"**Extends:** `{cls['parent']}`")
+        out.append(f"**Extends:** `{cls['parent']}`")
     
     if cls['docstring']:
-        lines.append(f"**Description:** {cls['docstring']}")
+        out.append(f"**Description:** {cls['docstring']}")
     
     if 'constructor' in cls:
-        lines.append("**Constructor:**")
+        out.append("**Constructor:**")
         if cls['constructor']['parameters']:
             for param in cls['constructor']['parameters']:
                 param_str = f"- `{param['name']}`"
                 if param['default']:
                     param_str += f" = `{param['default']}`"
-                lines.append(param_str)
+                out.append(param_str)
         else:
-            lines.append("- No parameters")
+            out.append("- No parameters")
     
     if cls['methods']:
-        lines.append("**Methods:**")
+        out.append("**Methods:**")
         for method in cls['methods']:
             static_prefix = "static " if method['is_static'] else ""
-            lines.append(f"#### {static_prefix}Method: `{method['name']}`")
+            out.append(f"#### {static_prefix}Method: `{method['name']}`")
             if method['parameters']:
-                lines.append("**Parameters:**")
+                out.append("**Parameters:**")
                 for param in method['parameters']:
                     param_str = f"- `{param['name']}`"
                     if param['default']:
                         param_str += f" = `{param['default']}`"
-                    lines.append(param_str)
+                    out.append(param_str)
             if method['docstring']:
-                lines.append(f"**Description:** {method['docstring']}")
-            lines.append("")
+                out.append(f"**Description:** {method['docstring']}")
+            out.append("")
     
-    lines.append("")
-    return lines
+    out.append("")
 
-def _format_function(func: Dict[str, Any]) -> List[str]:
-    """Format function information as markdown."""
+def _format_function(func: Dict[str, Any], out: List[str]) -> None:
+    """Append function information as markdown to out."""
     async_prefix = "async " if func.get('is_async', False) else ""
     arrow_suffix = " (arrow function)" if func.get('is_arrow', False) else ""
-    lines = [f"### {async_prefix}Function: `{func['name']}`{arrow_suffix}"]
+    out.append(f"### {async_prefix}Function: `{func['name']}`{arrow_suffix}")
     
     if func['parameters']:
-        lines.append("**Parameters:**")
+        out.append("**Parameters:**")
         for param in func['parameters']:
             param_str = f"- `{param['name']}`"
             if param['default']:
                 param_str += f" = `{param['default']}`"
             if param.get('is_destructured', False):
                 param_str += " (destructured)"
-            lines.append(param_str)
+            out.append(param_str)
     
     if func['docstring']:
-        lines.append(f"**Description:** {func['docstring']}")
+        out.append(f"**Description:** {func['docstring']}")
     
-    lines.append("")
-    return lines 
\ No newline at end of file
+    out.append("")
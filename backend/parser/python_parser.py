@@ -1,9 +1,17 @@
 import ast
+import math
+import inspect
+from collections import deque
 # import re
-from typing import List, Dict, Any  #, Optional
+from typing import List, Dict, Any, Tuple, Optional
+from parser._render_cache import cache_by_source
 
 # import markdown2
 
+# Node types that can contain statements; expressions never do
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+@cache_by_source()
 def parse_code_to_markdown(code: str) -> str:
     """Parse Python code and generate comprehensive markdown documentation."""
     try:
@@ -14,13 +22,16 @@ def parse_code_to_markdown(code: str) -> str:
     doc_lines = ["# Python Code Documentation\n"]
     
     # Parse module-level docstring
-    module_docstring = ast.get_docstring(tree)
+    module_docstring = _get_docstring(tree)
     if module_docstring:
         doc_lines.append("## Module Description")
         doc_lines.append(f"{module_docstring}\n")
     
+    # One walk over the tree gathers the nodes that can appear at any depth
+    import_nodes, class_nodes = _collect_nodes(tree)
+    
     # Parse imports
-    imports = _extract_imports(tree)
+    imports = _extract_imports(import_nodes)
     if imports:
         doc_lines.append("## Imports")
         for imp in imports:
@@ -36,25 +47,49 @@ def parse_code_to_markdown(code: str) -> str:
         doc_lines.append("")
     
     # Parse classes
-    classes = _extract_classes(tree)
+    classes = _extract_classes(class_nodes)
     if classes:
         doc_lines.append("## Classes")
         for cls in classes:
-            doc_lines.extend(_format_class(cls))
+            _format_class(cls, doc_lines)
     
     # Parse standalone functions (not in classes)
     functions = _extract_standalone_functions(tree)
     if functions:
         doc_lines.append("## Functions")
         for func in functions:
-            doc_lines.extend(_format_function(func))
+            _format_function(func, doc_lines)
     
     return "\n".join(doc_lines)
 
-def _extract_imports(tree: ast.AST) -> List[str]:
-    """Extract import statements from the AST."""
+def _collect_nodes(tree: ast.AST) -> Tuple[List[ast.stmt], List[ast.ClassDef]]:
+    """
+    Gather import statements and class definitions in a single walk.
+    
+    Only statement-level nodes are visited, since neither can appear inside an
+    expression; the breadth-first order matches ast.walk. Imports are collected
+    at any depth, but classes local to a function body are skipped.
+    """
+    import_nodes = []
+    class_nodes = []
+    queue = deque([(tree, False)])
+    while queue:
+        node, in_function = queue.popleft()
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            import_nodes.append(node)
+            continue
+        if isinstance(node, ast.ClassDef) and not in_function:
+            class_nodes.append(node)
+        in_function = in_function or isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STATEMENT_NODES):
+                queue.append((child, in_function))
+    return import_nodes, class_nodes
+
+def _extract_imports(import_nodes: List[ast.stmt]) -> List[str]:
+    """Extract import statements from the collected import nodes."""
     imports = []
-    for node in ast.walk(tree):
+    for node in import_nodes:
         if isinstance(node, ast.Import):
             for alias in node.names:
                 if alias.asname:
@@ -94,37 +129,36 @@ def _extract_global_variables(tree: ast.AST) -> List[Dict[str, Any]]:
             variables.append(var_info)
     return variables
 
-def _extract_classes(tree: ast.AST) -> List[Dict[str, Any]]:
+def _extract_classes(class_nodes: List[ast.ClassDef]) -> List[Dict[str, Any]]:
     """Extract class definitions with their methods and attributes."""
     classes = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef):
-            class_info = {
-                'name': node.name,
-                'docstring': ast.get_docstring(node),
-                'bases': [_get_annotation_string(base) for base in node.bases],
-                'decorators': [_get_annotation_string(dec) for dec in node.decorator_list],
-                'methods': [],
-                'attributes': []
-            }
-            
-            # Extract methods and attributes
-            for item in node.body:
-                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    method_info = _extract_function_info(item)
-                    method_info['is_method'] = True
-                    class_info['methods'].append(method_info)
-                elif isinstance(item, ast.Assign):
-                    for target in item.targets:
-                        if isinstance(target, ast.Name):
-                            attr_info = {
-                                'name': target.id,
-                                'type': _get_type_annotation(item),
-                                'value': _get_value_repr(item.value)
-                            }
-                            class_info['attributes'].append(attr_info)
-            
-            classes.append(class_info)
+    for node in class_nodes:
+        class_info = {
+            'name': node.name,
+            'docstring': _get_docstring(node),
+            'bases': [_get_annotation_string(base) for base in node.bases],
+            'decorators': [_get_annotation_string(dec) for dec in node.decorator_list],
+            'methods': [],
+            'attributes': []
+        }
+        
+        # Extract methods and attributes
+        for item in node.body:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                method_info = _extract_function_info(item)
+                method_info['is_method'] = True
+                class_info['methods'].append(method_info)
+            elif isinstance(item, ast.Assign):
+                for target in item.targets:
+                    if isinstance(target, ast.Name):
+                        attr_info = {
+                            'name': target.id,
+                            'type': _get_type_annotation(item),
+                            'value': _get_value_repr(item.value)
+                        }
+                        class_info['attributes'].append(attr_info)
+        
+        classes.append(class_info)
     return classes
 
 def _extract_standalone_functions(tree: ast.AST) -> List[Dict[str, Any]]:
@@ -141,7 +175,7 @@ def _extract_function_info(node: ast.FunctionDef | ast.AsyncFunctionDef) -> Dict
     """Extract detailed information about a function."""
     return {
         'name': node.name,
-        'docstring': ast.get_docstring(node),
+        'docstring': _get_docstring(node),
         'arguments': _extract_function_args(node),
         'return_type': _get_annotation_string(node.returns) if node.returns else None,
         'decorators': [_get_annotation_string(dec) for dec in node.decorator_list],
@@ -186,11 +220,70 @@ def _extract_function_args(node: ast.FunctionDef | ast.AsyncFunctionDef) -> List
     
     return args
 
+def _get_docstring(node: ast.AST) -> Optional[str]:
+    """
+    Return the cleaned docstring of a module, class or function node.
+    
+    Same result as ast.get_docstring; the common no-docstring case is decided
+    with a couple of type checks and never reaches the cleanup step.
+    """
+    body = node.body
+    if not body or type(body[0]) is not ast.Expr:
+        return None
+    value = body[0].value
+    if type(value) is not ast.Constant or type(value.value) is not str:
+        return None
+    return inspect.cleandoc(value.value)
+
 def _get_annotation_string(annotation) -> str:
     """Convert an AST annotation to a string representation."""
     if annotation is None:
         return "Any"
-    return ast.unparse(annotation)
+    text = _simple_source(annotation)
+    return text if text is not None else ast.unparse(annotation)
+
+def _simple_source(node) -> Optional[str]:
+    """
+    Render the common simple node shapes without ast.unparse.
+    
+    Handles names, dotted names, plain constants and subscripts built from
+    them (e.g. Dict[str, int]), producing exactly what ast.unparse would.
+    Returns None for anything else so the caller can fall back to it.
+    """
+    node_type = type(node)
+    if node_type is ast.Name:
+        return node.id
+    if node_type is ast.Attribute:
+        if type(node.value) not in (ast.Name, ast.Attribute):
+            return None
+        value = _simple_source(node.value)
+        return None if value is None else f"{value}.{node.attr}"
+    if node_type is ast.Constant:
+        value = node.value
+        value_type = type(value)
+        if value is None or value_type is int or value_type is bool:
+            return repr(value)
+        if value_type is float and math.isfinite(value):
+            return repr(value)
+        if value_type is str and node.kind is None and value.isprintable() and not any(c in value for c in '\'"\\'):
+            return repr(value)
+        return None
+    if node_type is ast.Subscript:
+        if type(node.value) not in (ast.Name, ast.Attribute):
+            return None
+        value = _simple_source(node.value)
+        if value is None:
+            return None
+        if type(node.slice) is ast.Tuple:
+            if len(node.slice.elts) < 2:
+                return None
+            parts = [_simple_source(elt) for elt in node.slice.elts]
+            if None in parts:
+                return None
+            return f"{value}[{', '.join(parts)}]"
+        inner = _simple_source(node.slice)
+        return None if inner is None else f"{value}[{inner}]"
+    return None
 
 def _get_type_annotation(node) -> str:
     """Get type annotation from a node."""
@@ -202,62 +295,63 @@ def _get_value_repr(node) -> str:
     """Get string representation of a value node."""
     if node is None:
         return "None"
+    text = _simple_source(node)
+    if text is not None:
+        return text
     try:
         return ast.unparse(node)
     except Exception:
         return str(type(node).__name__)
 
-def _format_class(cls: Dict[str, Any]) -> List[str]:
-    """Format class information as markdown."""
-    lines = [f"### Class: `{cls['name']}`"]
+def _format_class(cls: Dict[str, Any], out: List[str]) -> None:
+    """Append class information as markdown to out."""
+    out.append(f"### Class: `{cls['name']}`")
     
     if cls['bases']:
-        lines.append(f"**Inherits from:** {', '.join(f'`{base}`' for base in cls['bases'])}")
+        out.append(f"**Inherits from:** {', '.join(f'`{base}`' for base in cls['bases'])}")
     
     if cls['decorators']:
-        lines.append(f"**Decorators:** {', '.join(f'`@{dec}`' for dec in cls['decorators'])}")
+        out.append(f"**Decorators:** {', '.join(f'`@{dec}`' for dec in cls['decorators'])}")
     
     if cls['docstring']:
-        lines.append(f"**Description:** {cls['docstring']}")
+        out.append(f"**Description:** {cls['docstring']}")
     
     if cls['attributes']:
-        lines.append("**Attributes:**")
+        out.append("**Attributes:**")
         for attr in cls['attributes']:
             default_text = f" = `{attr['value']}`" if attr['value'] != "None" else ""
-            lines.append(f"- `{attr['name']}`: {attr['type']}{default_text}")
+            out.append(f"- `{attr['name']}`: {attr['type']}{default_text}")
     
     if cls['methods']:
-        lines.append("**Methods:**")
+        out.append("**Methods:**")
         for method in cls['methods']:
-            lines.extend(_format_function(method, is_method=True))
+            _format_function(method, out, is_method=True)
     
-    lines.append("")
-    return lines
+    out.append("")
 
-def _format_function(func: Dict[str, Any], is_method: bool = False) -> List[str]:
-    """Format function information as markdown."""
+def _format_function(func: Dict[str, Any], out: List[str], is_method: bool = False) -> None:
+    """Append function information as markdown to out."""
     prefix = "####" if is_method else "###"
     async_prefix = "async " if func.get('is_async', False) else ""
-    lines = [f"{prefix} {async_prefix}Function: `{func['name']}`"]
+    out.append(f"{prefix} {async_prefix}Function: `{func['name']}`")
     
     if func['decorators']:
-        lines.append(f"**Decorators:** {', '.join(f'`@{dec}`' for dec in func['decorators'])}")
+        out.append(f"**Decorators:** {', '.join(f'`@{dec}`' for dec in func['decorators'])}")
     
     if func['arguments']:
-        lines.append("**Arguments:**")
+        out.append("**Arguments:**")
         for arg in func['arguments']:
             arg_str = f"- `{arg['name']}`"
             if arg['type']:
                 arg_str += f": {arg['type']}"
             if arg['default']:
                 arg_str += f" = `{arg['default']}`"
-            lines.append(arg_str)
+            out.append(arg_str)
     
     if func['return_type']:
-        lines.append(f"**Returns:** {func['return_type']}")
+        out.append(f"**Returns:** {func['return_type']}")
     
     if func['docstring']:
-        lines.append(f"**Description:** {func['docstring']}")
+        out.append(f"**Description:** {func['docstring']}")
     
-    lines.append("")
-    return lines
+    out.append("")
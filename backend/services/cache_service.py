@@ -1,10 +1,35 @@
+import time
 import logging
+from collections import OrderedDict
 from fastapi import HTTPException, Query
-from fastapi.responses import PlainTextResponse
-from cache_manager import file_cache
+from fastapi.responses import StreamingResponse
+from cache_manager import file_cache, format_timestamp
 
 logger = logging.getLogger(__name__)
 
+# File IDs recently looked up and not found -> monotonic expiry time. Repeated
+# probes for expired links or random IDs are answered without a cache lookup.
+_MISSING_TTL_SECONDS = 30.0
+_MISSING_MAX_ENTRIES = 1024
+_missing_ids: "OrderedDict[str, float]" = OrderedDict()
+
+def _is_known_missing(file_id: str) -> bool:
+    """Check whether file_id was recently found missing"""
+    expires_at = _missing_ids.get(file_id)
+    if expires_at is None:
+        return False
+    if expires_at < time.monotonic():
+        del _missing_ids[file_id]
+        return False
+    return True
+
+def _remember_missing(file_id: str):
+    """Record a missed lookup, evicting the oldest record when full"""
+    _missing_ids[file_id] = time.monotonic() + _MISSING_TTL_SECONDS
+    _missing_ids.move_to_end(file_id)
+    if len(_missing_ids) > _MISSING_MAX_ENTRIES:
+        _missing_ids.popitem(last=False)
+
 async def get_recent_files(limit: int = Query(10, ge=1, le=50)):
     """
     Get list of recently uploaded files from cache.
@@ -12,9 +37,9 @@ async def get_recent_files(limit: int = Query(10, ge=1, le=50)):
     Args:
         limit: Number of files to return (1-50, default: 10)
     """
-    logger.info(f"Recent files requested - Limit: {limit}")
+    logger.info("Recent files requested - Limit: %s", limit)
     recent_files = file_cache.get_recent_files(limit)
-    logger.info(f"Retrieved {len(recent_files)} recent files from cache")
+    logger.info("Retrieved %s recent files from cache", len(recent_files))
     
     return {
         "recent_files": recent_files,
@@ -29,24 +54,36 @@ async def get_cached_file(file_id: str):
     Args:
         file_id: Unique identifier of the cached file
     """
-    logger.info(f"Cached file requested - ID: {file_id}")
-    cached_file = file_cache.get_file(file_id)
+    logger.info("Cached file requested - ID: %s", file_id)
+    # Only a fresh miss is recorded, so the record expires _MISSING_TTL_SECONDS
+    # after the lookup rather than being extended by every repeated probe
+    cached_file = None
+    if not _is_known_missing(file_id):
+        cached_file = file_cache.get_file(file_id)
+        if cached_file:
+            try:
+                content = cached_file.text
+            except OSError:
+                # Evicted since get_file, which unlinks a spooled entry's file
+                cached_file = None
+        if not cached_file:
+            _remember_missing(file_id)
     
     if not cached_file:
-        logger.warning(f"Cached file not found - ID: {file_id}")
+        logger.warning("Cached file not found - ID: %s", file_id)
         raise HTTPException(status_code=404, detail="File not found or expired")
     
-    logger.info(f"Cached file retrieved - ID: {file_id}, Filename: {cached_file.filename}, Language: {cached_file.language}")
+    logger.info("Cached file retrieved - ID: %s, Filename: %s, Language: %s", file_id, cached_file.filename, cached_file.language)
     
     return {
         "file_id": file_id,
         "filename": cached_file.filename,
         "language": cached_file.language,
         "file_type": cached_file.file_type,
-        "content": cached_file.content,
-        "upload_time": cached_file.upload_time.isoformat(),
+        "content": content,
+        "upload_time": format_timestamp(cached_file.upload_time),
         "file_size": cached_file.file_size,
-        "expires_at": cached_file.expires_at.isoformat()
+        "expires_at": format_timestamp(cached_file.expires_at)
     }
 
 async def download_cached_file(file_id: str):
@@ -56,17 +93,29 @@ async def download_cached_file(file_id: str):
     Args:
         file_id: Unique identifier of the cached file
     """
-    logger.info(f"File download requested - ID: {file_id}")
-    cached_file = file_cache.get_file(file_id)
+    logger.info("File download requested - ID: %s", file_id)
+    cached_file = None
+    if not _is_known_missing(file_id):
+        cached_file = file_cache.get_file(file_id)
+        if cached_file:
+            try:
+                chunks = cached_file.iter_chunks()
+            except OSError:
+                # Evicted since get_file, which unlinks a spooled entry's file
+                cached_file = None
+        if not cached_file:
+            _remember_missing(file_id)
     
     if not cached_file:
-        logger.warning(f"Download failed - File not found: {file_id}")
+        logger.warning("Download failed - File not found: %s", file_id)
         raise HTTPException(status_code=404, detail="File not found or expired")
     
-    logger.info(f"File download starting - ID: {file_id}, Filename: {cached_file.filename}")
+    logger.info("File download starting - ID: %s, Filename: %s", file_id, cached_file.filename)
     
-    return PlainTextResponse(
-        content=cached_file.content,
+    # Stream in chunks so large (possibly spooled) files are never held in memory whole
+    return StreamingResponse(
+        chunks,
+        media_type="text/plain",
         headers={"Content-Disposition": f"attachment; filename={cached_file.filename}"}
     )
 
@@ -74,7 +123,7 @@ async def get_cache_stats():
     """Get comprehensive cache statistics."""
     logger.info("Cache statistics requested")
     stats = file_cache.get_cache_stats()
-    logger.info(f"Cache stats - Total files: {stats['total_files']}, Total size: {stats['total_size_bytes']} bytes")
+    logger.info("Cache stats - Total files: %s, Total size: %s bytes", stats['total_files'], stats['total_size_bytes'])
     
     return {
         "cache_stats": stats,
@@ -88,14 +137,14 @@ async def delete_cached_file(file_id: str):
     Args:
         file_id: Unique identifier of the cached file
     """
-    logger.info(f"Delete cached file requested - ID: {file_id}")
+    logger.info("Delete cached file requested - ID: %s", file_id)
     success = file_cache.delete_file(file_id)
     
     if not success:
-        logger.warning(f"Failed to delete cached file - ID not found: {file_id}")
+        logger.warning("Failed to delete cached file - ID not found: %s", file_id)
         raise HTTPException(status_code=404, detail="File not found")
     
-    logger.info(f"Cached file deleted successfully - ID: {file_id}")
+    logger.info("Cached file deleted successfully - ID: %s", file_id)
     
     return {
         "file_id": file_id,
@@ -106,7 +155,7 @@ async def clear_all_cache():
     """Clear all cached files."""
     logger.info("Clear all cache requested")
     deleted_count = file_cache.clear_cache()
-    logger.info(f"Cache cleared - {deleted_count} files deleted")
+    logger.info("Cache cleared - %s files deleted", deleted_count)
     
     return {
         "deleted_files": deleted_count,
@@ -126,26 +175,12 @@ async def search_cached_files(
         file_type: Filter by file type (uploaded, generated)
         filename: Filter by filename (partial match)
     """
-    logger.info(f"File search requested - Language: {language}, Type: {file_type}, Filename: {filename}")
-    
-    all_files = file_cache.get_recent_files(limit=100)  # Get more files for filtering
-    logger.info(f"Retrieved {len(all_files)} files for filtering")
-    
-    filtered_files = all_files
-    
-    if language:
-        filtered_files = [f for f in filtered_files if f['language'].lower() == language.lower()]
-        logger.info(f"Filtered by language '{language}': {len(filtered_files)} files")
-    
-    if file_type:
-        filtered_files = [f for f in filtered_files if f['file_type'].lower() == file_type.lower()]
-        logger.info(f"Filtered by type '{file_type}': {len(filtered_files)} files")
+    logger.info("File search requested - Language: %s, Type: %s, Filename: %s", language, file_type, filename)
     
-    if filename:
-        filtered_files = [f for f in filtered_files if filename.lower() in f['filename'].lower()]
-        logger.info(f"Filtered by filename '{filename}': {len(filtered_files)} files")
+    # All filters are applied in a single pass inside the cache
+    filtered_files = file_cache.search_files(language, file_type, filename, limit=100)
     
-    logger.info(f"Search completed - Found {len(filtered_files)} matching files")
+    logger.info("Search completed - Found %s matching files", len(filtered_files))
     
     return {
         "files": filtered_files,
@@ -1,7 +1,12 @@
 import os
 import time
+import codecs
+import asyncio
 import logging
+import tempfile
+from typing import Optional, Tuple
 from fastapi import UploadFile, File
+from fastapi.responses import JSONResponse
 from parser.python_parser import parse_code_to_markdown as parse_python_to_markdown
 from parser.java_parser import parse_code_to_markdown as parse_java_to_markdown
 from parser.javascript_parser import parse_code_to_markdown as parse_javascript_to_markdown
@@ -9,25 +14,79 @@ from cache_manager import file_cache
 
 logger = logging.getLogger(__name__)
 
-async def parse_code_endpoint(file: UploadFile = File(...)):
+# Uploads are read in chunks of this size; bodies larger than the spool size
+# are buffered on disk instead of in memory
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+_UPLOAD_SPOOL_SIZE = 1 << 20
+
+async def _read_upload(file: UploadFile) -> Tuple[str, tempfile.SpooledTemporaryFile]:
+    """
+    Stream an upload into a spooled temporary file, decoding UTF-8 as it arrives.
+    Returns the decoded text and the spool rewound to its start.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    spool = tempfile.SpooledTemporaryFile(max_size=_UPLOAD_SPOOL_SIZE, mode='w+b')
+    parts = []
+    try:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            parts.append(decoder.decode(chunk))
+            spool.write(chunk)
+        parts.append(decoder.decode(b'', final=True))
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return ''.join(parts), spool
+
+async def parse_code_endpoint(file: Optional[UploadFile] = File(None), file_id: Optional[str] = None):
     """
     Upload a code file and generate markdown documentation.
     Supports Python (.py), Java (.java), and JavaScript (.js/.jsx) files.
     Returns the generated markdown content and file information.
+    
+    Instead of uploading, file_id may name a file already in the cache, such as
+    the uploaded_file_id returned by an earlier /suggest/ call.
     """
     start_time = time.time()
     
-    logger.info(f"Parse code endpoint accessed - File: {file.filename}, Size: {file.size} bytes")
+    # A file cached by an earlier upload can be referenced instead of re-sent
+    cached_upload = None
+    if file_id is not None:
+        cached_upload = file_cache.get_file(file_id)
+        if cached_upload is not None:
+            try:
+                code_content = cached_upload.text
+            except OSError:
+                # Evicted since get_file, which unlinks a spooled entry's file
+                cached_upload = None
+        if cached_upload is None:
+            logger.warning(f"Parse code endpoint accessed with unknown file ID: {file_id}")
+            return {
+                "error": "File not found",
+                "file_id": file_id,
+                "message": "Cached file not found or expired"
+            }
+        source_name = cached_upload.filename
+        logger.info(f"Parse code endpoint accessed - Cached file ID: {file_id}, File: {source_name}")
+    elif file is None:
+        logger.warning("Parse code endpoint accessed without a file or file ID")
+        return {
+            "error": "No file provided",
+            "message": "Upload a file or pass the file_id of a cached upload"
+        }
+    else:
+        source_name = file.filename
+        logger.info(f"Parse code endpoint accessed - File: {source_name}, Size: {file.size} bytes")
     
     # Check file type before processing
-    filename = file.filename.lower()
+    filename = source_name.lower()
     supported_extensions = ['.py', '.java', '.js', '.jsx']
     
     if not any(filename.endswith(ext) for ext in supported_extensions):
-        logger.warning(f"Unsupported file type uploaded: {file.filename}")
+        logger.warning(f"Unsupported file type uploaded: {source_name}")
         return {
             "error": "Unsupported file type",
-            "filename": file.filename,
+            "filename": source_name,
             "supported_types": [".py (Python)", ".java (Java)", ".js/.jsx (JavaScript)"],
             "message": "Please upload a Python, Java, or JavaScript file"
         }
@@ -40,72 +99,86 @@ async def parse_code_endpoint(file: UploadFile = File(...)):
     elif filename.endswith('.js') or filename.endswith('.jsx'):
         language = "JavaScript"
     
-    logger.info(f"Processing {language} file: {file.filename}")
+    logger.info(f"Processing {language} file: {source_name}")
     
     try:
-        # Read file content
-        content = await file.read()
-        code_content = content.decode('utf-8')
-        
-        logger.info(f"File content read successfully - Characters: {len(code_content)}")
-        
-        # Store uploaded file in cache
-        try:
-            uploaded_file_id = file_cache.store_file(file.filename, code_content, 'uploaded')
-            logger.info(f"File stored in cache with ID: {uploaded_file_id}")
-        except Exception as e:
-            logger.error(f"Failed to store file in cache: {e}")
-            # Continue without cache storage
-            uploaded_file_id = "cache_error"
+        if cached_upload is not None:
+            uploaded_file_id = file_id
+            logger.info(f"File content read from cache - Characters: {len(code_content)}")
+        else:
+            # Read file content without buffering the raw upload in memory
+            code_content, spool = await _read_upload(file)
+            
+            logger.info(f"File content read successfully - Characters: {len(code_content)}")
+            
+            # Store uploaded file in cache
+            try:
+                uploaded_file_id = file_cache.store_stream(source_name, spool, 'uploaded')
+                logger.info(f"File stored in cache with ID: {uploaded_file_id}")
+            except Exception as e:
+                logger.error(f"Failed to store file in cache: {e}")
+                # Continue without cache storage
+                uploaded_file_id = "cache_error"
+            finally:
+                spool.close()
         
         try:
             # Generate markdown documentation directly
             logger.info(f"Detected {language} file, using {language} parser")
             
-            if filename.endswith('.py'):
-                markdown_content = parse_python_to_markdown(code_content)
-            elif filename.endswith('.java'):
-                markdown_content = parse_java_to_markdown(code_content)
-            elif filename.endswith('.js') or filename.endswith('.jsx'):
-                markdown_content = parse_javascript_to_markdown(code_content)
+            # Identical content parsed before is served from the cache
+            markdown_content = file_cache.get_parsed(uploaded_file_id, language)
+            if markdown_content is not None:
+                logger.info(f"Reusing cached documentation for file ID: {uploaded_file_id}")
+            else:
+                if filename.endswith('.py'):
+                    parse_to_markdown = parse_python_to_markdown
+                elif filename.endswith('.java'):
+                    parse_to_markdown = parse_java_to_markdown
+                elif filename.endswith('.js') or filename.endswith('.jsx'):
+                    parse_to_markdown = parse_javascript_to_markdown
+                # Parsing is CPU-bound; run it on a worker thread so the event loop keeps serving
+                markdown_content = await asyncio.to_thread(parse_to_markdown, code_content)
+                file_cache.store_parsed(uploaded_file_id, language, markdown_content)
             
             # Store generated markdown in cache
-            markdown_filename = f"{os.path.splitext(file.filename)[0]}_docs.md"
+            markdown_filename = f"{os.path.splitext(source_name)[0]}_docs.md"
             generated_file_id = file_cache.store_file(markdown_filename, markdown_content, 'generated')
             
             processing_time = time.time() - start_time
             logger.info(f"Documentation generated successfully - Generated file ID: {generated_file_id}, Processing time: {processing_time:.2f}s")
             
-            return {
-                "filename": file.filename,
+            # The markdown can be large; encode the JSON body off the event loop
+            return await asyncio.to_thread(JSONResponse, {
+                "filename": source_name,
                 "language": language,
                 "uploaded_file_id": uploaded_file_id,
                 "generated_file_id": generated_file_id,
                 "markdown_content": markdown_content,
                 "message": f"Successfully generated {language} documentation"
-            }
+            })
         except ValueError as e:
             processing_time = time.time() - start_time
-            logger.error(f"Processing error for file {file.filename}: {str(e)}, Time: {processing_time:.2f}s")
+            logger.error(f"Processing error for file {source_name}: {str(e)}, Time: {processing_time:.2f}s")
             return {
                 "error": "Processing error",
-                "filename": file.filename,
+                "filename": source_name,
                 "message": str(e)
             }
         except Exception as e:
             processing_time = time.time() - start_time
-            logger.error(f"Unexpected error processing file {file.filename}: {str(e)}, Time: {processing_time:.2f}s")
+            logger.error(f"Unexpected error processing file {source_name}: {str(e)}, Time: {processing_time:.2f}s")
             return {
                 "error": "Unexpected error",
-                "filename": file.filename,
+                "filename": source_name,
                 "message": f"Failed to process file: {str(e)}"
             }
                 
     except Exception as e:
         processing_time = time.time() - start_time
-        logger.error(f"Critical error in parse endpoint for file {file.filename}: {str(e)}, Time: {processing_time:.2f}s")
+        logger.error(f"Critical error in parse endpoint for file {source_name}: {str(e)}, Time: {processing_time:.2f}s")
         return {
             "error": "Critical error",
-            "filename": file.filename,
+            "filename": source_name,
             "message": f"System error: {str(e)}"
         } 
\ No newline at end of file
@@ -1,6 +1,9 @@
 import time
+import asyncio
 import logging
+from typing import Optional
 from fastapi import UploadFile, File
+from fastapi.responses import JSONResponse
 from suggestor.python_suggestor import suggest_refactor
 from suggestor.java_suggestor import suggest_refactor_java
 from suggestor.javascript_suggestor import suggest_refactor_javascript
@@ -8,67 +11,111 @@ from cache_manager import file_cache
 
 logger = logging.getLogger(__name__)
 
-async def suggest_refactoring(file: UploadFile = File(...)):
+async def suggest_refactoring(file: Optional[UploadFile] = File(None), file_id: Optional[str] = None):
     """
     Upload a code file and get language-specific refactoring suggestions.
     Supports Python (.py), Java (.java), and JavaScript (.js) files.
+    
+    Instead of uploading, file_id may name a file already in the cache, such as
+    the uploaded_file_id returned by an earlier /parse-code/ call.
     """
     start_time = time.time()
-    logger.info(f"Suggest endpoint accessed - File: {file.filename}, Size: {file.size} bytes")
+    # A file cached by an earlier upload can be referenced instead of re-sent
+    cached_upload = None
+    if file_id is not None:
+        cached_upload = file_cache.get_file(file_id)
+        if cached_upload is not None:
+            try:
+                code_content = cached_upload.text
+            except OSError:
+                # Evicted since get_file, which unlinks a spooled entry's file
+                cached_upload = None
+        if cached_upload is None:
+            logger.warning(f"Suggest endpoint accessed with unknown file ID: {file_id}")
+            return {
+                "error": "File not found",
+                "file_id": file_id,
+                "message": "Cached file not found or expired"
+            }
+        source_name = cached_upload.filename
+        logger.info(f"Suggest endpoint accessed - Cached file ID: {file_id}, File: {source_name}")
+    elif file is None:
+        logger.warning("Suggest endpoint accessed without a file or file ID")
+        return {
+            "error": "No file provided",
+            "message": "Upload a file or pass the file_id of a cached upload"
+        }
+    else:
+        source_name = file.filename
+        logger.info(f"Suggest endpoint accessed - File: {source_name}, Size: {file.size} bytes")
     
     try:
-        content = await file.read()
-        code_content = content.decode()
-        
-        logger.info(f"File content read for suggestions - Characters: {len(code_content)}")
-        
-        # Store uploaded file in cache
-        try:
-            uploaded_file_id = file_cache.store_file(file.filename, code_content, 'uploaded')
-            logger.info(f"File stored in cache with ID: {uploaded_file_id}")
-        except Exception as e:
-            logger.error(f"Failed to store file in cache: {e}")
-            uploaded_file_id = "cache_error"
+        if cached_upload is not None:
+            uploaded_file_id = file_id
+            logger.info(f"File content read from cache for suggestions - Characters: {len(code_content)}")
+        else:
+            content = await file.read()
+            code_content = content.decode()
+            
+            logger.info(f"File content read for suggestions - Characters: {len(code_content)}")
+            
+            # Store uploaded file in cache
+            try:
+                uploaded_file_id = file_cache.store_file(source_name, content, 'uploaded')
+                logger.info(f"File stored in cache with ID: {uploaded_file_id}")
+            except Exception as e:
+                logger.error(f"Failed to store file in cache: {e}")
+                uploaded_file_id = "cache_error"
         
         # Detect language based on file extension
-        filename = file.filename.lower()
+        filename = source_name.lower()
         
         if filename.endswith('.py'):
             logger.info("Generating Python refactoring suggestions")
-            suggestions = suggest_refactor(code_content)
+            suggest = suggest_refactor
             language = "Python"
         elif filename.endswith('.java'):
             logger.info("Generating Java refactoring suggestions")
-            suggestions = suggest_refactor_java(code_content)
+            suggest = suggest_refactor_java
             language = "Java"
         elif filename.endswith('.js') or filename.endswith('.jsx'):
             logger.info("Generating JavaScript refactoring suggestions")
-            suggestions = suggest_refactor_javascript(code_content)
+            suggest = suggest_refactor_javascript
             language = "JavaScript"
         else:
-            logger.warning(f"Unsupported file type for suggestions: {file.filename}")
+            logger.warning(f"Unsupported file type for suggestions: {source_name}")
             return {
                 "error": "Unsupported file type",
                 "supported_types": [".py (Python)", ".java (Java)", ".js/.jsx (JavaScript)"],
-                "filename": file.filename
+                "filename": source_name
             }
         
+        # Identical content analysed before is served from the cache
+        suggestions = file_cache.get_suggestions(uploaded_file_id, language)
+        if suggestions is not None:
+            logger.info(f"Reusing cached suggestions for file ID: {uploaded_file_id}")
+        else:
+            # Analysis is CPU-bound; run it on a worker thread so the event loop keeps serving
+            suggestions = await asyncio.to_thread(suggest, code_content)
+            file_cache.store_suggestions(uploaded_file_id, language, suggestions)
+        
         processing_time = time.time() - start_time
         logger.info(f"Suggestions generated successfully - Language: {language}, Count: {len(suggestions)}, Time: {processing_time:.2f}s")
         
-        return {
-            "filename": file.filename,
+        # Encode the JSON body off the event loop; large files yield long lists
+        return await asyncio.to_thread(JSONResponse, {
+            "filename": source_name,
             "language": language,
             "uploaded_file_id": uploaded_file_id,
             "total_suggestions": len(suggestions),
             "suggestions": suggestions
-        }
+        })
         
     except Exception as e:
         processing_time = time.time() - start_time
-        logger.error(f"Error generating suggestions for file {file.filename}: {str(e)}, Time: {processing_time:.2f}s")
+        logger.error(f"Error generating suggestions for file {source_name}: {str(e)}, Time: {processing_time:.2f}s")
         return {
             "error": "Processing error",
-            "filename": file.filename,
+            "filename": source_name,
             "message": f"Failed to generate suggestions: {str(e)}"
         } 
\ No newline at end of file
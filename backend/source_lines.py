@@ -0,0 +1,15 @@
+from bisect import bisect_right
+from typing import List
+
+def line_start_offsets(code: str) -> List[int]:
+    """Return the offset at which each line of the source begins."""
+    starts = [0]
+    pos = code.find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = code.find('\n', pos + 1)
+    return starts
+
+def line_of(line_starts: List[int], offset: int) -> int:
+    """Convert a source offset to a zero-based line number."""
+    return bisect_right(line_starts, offset) - 1
@@ -0,0 +1,33 @@
+import re
+from functools import lru_cache
+from typing import Dict
+from source_lines import line_start_offsets, line_of
+
+class Misspellings:
+    """A misspelling -> correction dictionary and the patterns compiled from it"""
+    
+    def __init__(self, corrections: Dict[str, str]):
+        self.corrections = corrections
+        # Any misspelling as a substring; one scan of the lowercased file finds every
+        # line that can produce a spelling suggestion
+        self.pattern = re.compile('|'.join(map(re.escape, corrections)))
+        # Lookahead form reports every occurrence in an identifier, overlapping ones
+        # included; no misspelling is a prefix of another, so none is shadowed.
+        # Hits are reported in dictionary order.
+        self._overlap_pattern = re.compile(f'(?=({self.pattern.pattern}))')
+        self._rank = {misspelling: rank for rank, misspelling in enumerate(corrections)}
+        # Identifiers recur across lines and files, so lookups are memoized
+        self.in_identifier = lru_cache(maxsize=4096)(self._in_identifier)
+    
+    def lines(self, code: str) -> set:
+        """Return the 1-based numbers of lines containing any known misspelling"""
+        # Indexed on the lowercased text: a few characters lowercase to two,
+        # shifting offsets past them
+        lower_code = code.lower()
+        line_starts = line_start_offsets(lower_code)
+        return {line_of(line_starts, match.start()) + 1 for match in self.pattern.finditer(lower_code)}
+    
+    def _in_identifier(self, lower_id: str) -> tuple:
+        """Return the (misspelling, correction) pairs found in a lowercased identifier"""
+        found = set(self._overlap_pattern.findall(lower_id))
+        return tuple((misspelling, self.corrections[misspelling]) for misspelling in sorted(found, key=self._rank.__getitem__))
@@ -1,230 +1,304 @@
 import re
+from itertools import chain
+from suggestor._spelling import Misspellings
+
+# Patterns are compiled once at import time and shared by every call. Each
+# check tests a literal the pattern cannot match without before entering the
+# regex engine, which most lines fail.
+# (?<!...) lookbehinds below skip start positions that cannot lead to an
+# earlier match, keeping searches linear on long runs of the same character
+_STRING_EQ_RE = re.compile(r'"[^"]*"\s*==\s*\w+|(?<!w)w+\s*==\s*"[^"]*"')
+_MAGIC_NUMBER_RE = re.compile(r'\b(?!0|1)\d{2,}\b')
+_MULTI_DECL_RE = re.compile(r'(int|String|boolean|double|float|long)\s+\w+\s*,\s*\w+')
+_RAW_TYPE_RE = re.compile(r'\b(List|Map|Set|ArrayList|HashMap|HashSet)\s+\w+\s*=')
+_GENERIC_RE = re.compile(r'<[^>]+>')
+_CLASS_NAME_RE = re.compile(r'class\s+([a-z]\w*)')
+_METHOD_NAME_RE = re.compile(r'(public|private|protected).*?(?<!\s)\s+([A-Z]\w*)\s*\(')
+_VARIABLE_NAME_RE = re.compile(r'(int|String|boolean|double|float|long)\s+([A-Z]\w*)')
+_CONSTANT_NAME_RE = re.compile(r'final\s+static\s+\w+\s+([a-z]\w*)')
+_PACKAGE_NAME_RE = re.compile(r'package\s+([^;]*[A-Z][^;]*)')
+_NEW_RANDOM_RE = re.compile(r'new\s+Random\(\)')
+_WRAPPER_CTOR_RE = re.compile(r'new\s+(Integer|Double|Boolean|Float|Long)\(')
+_COMMENT_RE = re.compile(r'//(.*)|/\*([^*]|\*[^/])*\*/')
+_STRING_LITERAL_RE = re.compile(r'"([^"]+)"')
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+_IDENTIFIER_RE = re.compile(r'\b([a-zA-Z_]\w*)\b')
+_PUBLIC_METHOD_RE = re.compile(r'public\s+\w+\s+\w+\s*\(')
+_OVERRIDE_CANDIDATE_RE = re.compile(r'(toString|equals|hashCode|compareTo)\s*\(')
+_WORD_GAP_RE = re.compile(r'\w\s+\w')
+_I_PREFIXED_INTERFACE_RE = re.compile(r'interface\s+I[A-Z]')
+_INTERFACE_NAME_RE = re.compile(r'interface\s+(\w+)')
+
+# Common Java-specific misspellings
+_JAVA_MISSPELLINGS = {
+    'lenght': 'length',
+    'widht': 'width',
+    'heigh': 'height',
+    'recieve': 'receive',
+    'occured': 'occurred',
+    'seperator': 'separator',
+    'definately': 'definitely',
+    'succesful': 'successful',
+    'proccess': 'process',
+    'adress': 'address',
+    'sucess': 'success',
+    'manger': 'manager',
+    'comparsion': 'comparison',
+    'compatability': 'compatibility',
+    'accesible': 'accessible',
+    'colum': 'column',
+    'usualy': 'usually',
+    'ocasionally': 'occasionally',
+    'excpetion': 'exception',
+    'connexion': 'connection',
+    'initalize': 'initialize',
+    'implmentation': 'implementation'
+}
+
+_SPELLING = Misspellings(_JAVA_MISSPELLINGS)
+
+# ASCII characters outside \w -> space, so split() yields the \w runs
+_ASCII_NON_WORD = str.maketrans({c: ' ' for c in map(chr, range(128)) if not (c.isalnum() or c == '_')})
+
+def _words(text: str) -> list:
+    """
+    Lowercased candidate words of text for the misspelling lookup.
+    
+    ASCII text is split with translate/split instead of the regex; the result
+    may also hold runs with digits or underscores, which never match a
+    misspelling, so the hits are the same as with _WORD_RE.
+    """
+    lower_text = text.lower()
+    if lower_text.isascii():
+        return lower_text.translate(_ASCII_NON_WORD).split()
+    return _WORD_RE.findall(lower_text)
+
+def _has_typed_parameters(text: str) -> bool:
+    """
+    Whether text has a parenthesised group containing "word whitespace word".
+    
+    Linear replacement for searching r'\([^)]*\w+\s+\w+[^)]*\)', which
+    backtracks quadratically or worse on lines with unclosed parentheses.
+    For each ')' only the earliest '(' after the previous ')' needs checking,
+    since its span contains every other candidate span.
+    """
+    segments = text.split(')')
+    for segment in segments[:-1]:
+        open_pos = segment.find('(')
+        if open_pos != -1 and _WORD_GAP_RE.search(segment, open_pos + 1):
+            return True
+    return False
+
+# Any Java source file contains at least one of these
+_JAVA_MARKERS = ('class ', 'interface ', 'enum ', 'package ', 'import java',
+                 'public ', 'private ', 'protected ', 'void ')
+
+def _looks_like_java(code: str) -> bool:
+    """Cheap content sniff; False only for text with no Java declarations at all"""
+    return any(marker in code for marker in _JAVA_MARKERS)
 
 def suggest_refactor_java(code: str) -> list:
     """
     Analyze Java code and provide refactoring suggestions with line numbers.
     """
-    suggestions = []
+    # A mislabelled upload would only collect spurious hits from every check
+    if code and not code.isspace() and not _looks_like_java(code):
+        return ["⚠️ File extension says Java but the content does not appear to be Java - no suggestions generated"]
+    
     lines = code.split('\n')
     
     # Java-specific checks
-    suggestions.extend(_check_java_code_smells(code, lines))
-    suggestions.extend(_check_java_naming_conventions(code, lines))
-    suggestions.extend(_check_java_security_performance(code, lines))
-    suggestions.extend(_check_java_spelling_mistakes(code, lines))
-    suggestions.extend(_check_java_best_practices(code, lines))
-    
-    return suggestions
+    return _check_all_java(code, lines)
 
-def _check_java_code_smells(code: str, lines: list) -> list:
-    suggestions = []
+def _check_all_java(code: str, lines: list) -> list:
+    """Run every Java check in one pass over the lines, returning hits grouped by category without duplicates"""
+    code_smells = []
+    naming = []
+    security = []
+    spelling = []
+    practices = []
+    line_count = len(lines)
+    prev_line = ""
+    # Line number of the most recent line mentioning String
+    last_string_line = -5
+    misspelled_lines = _SPELLING.lines(code)
+    
+    # Needles absent from the whole file let their per-line checks be skipped
+    has_println = "System.out.println" in code
+    has_exec = 'Runtime.getRuntime().exec' in code
+    has_for_name = 'Class.forName' in code
+    has_random = 'Random()' in code
+    has_concat = '+=' in code
+    has_size = '.size()' in code
+    has_string_ctor = 'new String(' in code
+    has_vector = 'Vector' in code
+    has_hashtable = 'Hashtable' in code
+    # One C-level pass over the line lengths; most files have no long lines
+    has_long_lines = max(map(len, lines)) > 120
     
     for i, line in enumerate(lines, 1):
         line_content = line.strip()
         
+        # --- Code smells ---
+        
         # Empty catch blocks
         if line_content == "} catch" or (line_content.startswith("catch") and "{" in line_content):
-            next_lines = lines[i:i+3] if i < len(lines) - 2 else []
-            if any("}" in next_line.strip() and len(next_line.strip()) <= 1 for next_line in next_lines):
-                suggestions.append(f"🚫 Line {i}: Empty catch block - handle exceptions properly")
+            next_lines = lines[i:i+3] if i < line_count - 2 else []
+            if any(next_line.strip() == "}" for next_line in next_lines):
+                code_smells.append(f"🚫 Line {i}: Empty catch block - handle exceptions properly")
         
         # System.out.println in production
-        if "System.out.println" in line_content:
-            suggestions.append(f"🚫 Line {i}: Avoid System.out.println in production - use logging framework")
+        if has_println and "System.out.println" in line_content:
+            code_smells.append(f"🚫 Line {i}: Avoid System.out.println in production - use logging framework")
         
         # == for String comparison
-        if re.search(r'"[^"]*"\s*==\s*\w+|w+\s*==\s*"[^"]*"', line_content):
-            suggestions.append(f"🔧 Line {i}: Use .equals() instead of == for String comparison")
+        if '==' in line_content and _STRING_EQ_RE.search(line_content):
+            code_smells.append(f"🔧 Line {i}: Use .equals() instead of == for String comparison")
         
         # Magic numbers
-        if re.search(r'\b(?!0|1)\d{2,}\b', line_content) and not line_content.strip().startswith("//"):
-            suggestions.append(f"📏 Line {i}: Consider using named constants instead of magic numbers")
+        if _MAGIC_NUMBER_RE.search(line_content) and not line_content.startswith("//"):
+            code_smells.append(f"📏 Line {i}: Consider using named constants instead of magic numbers")
         
         # Long lines (Java convention: 120 chars)
-        if len(line) > 120:
-            suggestions.append(f"📏 Line {i}: Line too long ({len(line)} chars) - consider breaking it down")
+        if has_long_lines and (line_length := len(line)) > 120:
+            code_smells.append(f"📏 Line {i}: Line too long ({line_length} chars) - consider breaking it down")
         
         # Multiple variable declarations
-        if re.search(r'(int|String|boolean|double|float|long)\s+\w+\s*,\s*\w+', line_content):
-            suggestions.append(f"📦 Line {i}: Declare variables separately for better readability")
+        if ',' in line_content and _MULTI_DECL_RE.search(line_content):
+            code_smells.append(f"📦 Line {i}: Declare variables separately for better readability")
         
         # Raw types (generics)
-        if re.search(r'\b(List|Map|Set|ArrayList|HashMap|HashSet)\s+\w+\s*=', line_content):
-            if not re.search(r'<[^>]+>', line_content):
-                suggestions.append(f"⚠️ Line {i}: Use generics instead of raw types")
+        if '=' in line_content and _RAW_TYPE_RE.search(line_content):
+            if not _GENERIC_RE.search(line_content):
+                code_smells.append(f"⚠️ Line {i}: Use generics instead of raw types")
         
         # Nested if statements (check for multiple 'if' in one line or subsequent lines)
         if line_content.count('if') > 1:
-            suggestions.append(f"🔧 Line {i}: Avoid nested if statements - consider using guard clauses")
-    
-    return suggestions
-
-def _check_java_naming_conventions(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for i, line in enumerate(lines, 1):
-        line_content = line.strip()
+            code_smells.append(f"🔧 Line {i}: Avoid nested if statements - consider using guard clauses")
+        
+        # --- Naming conventions ---
         
         # Class names should be PascalCase
-        class_match = re.search(r'class\s+([a-z]\w*)', line_content)
+        class_match = 'class' in line_content and _CLASS_NAME_RE.search(line_content)
         if class_match:
             class_name = class_match.group(1)
-            suggestions.append(f"🏗️ Line {i}: Class '{class_name}' should use PascalCase naming")
+            naming.append(f"🏗️ Line {i}: Class '{class_name}' should use PascalCase naming")
         
         # Method names should be camelCase
-        method_match = re.search(r'(public|private|protected).*?\s+([A-Z]\w*)\s*\(', line_content)
+        method_match = '(' in line_content and _METHOD_NAME_RE.search(line_content)
         if method_match:
             method_name = method_match.group(2)
-            suggestions.append(f"🔧 Line {i}: Method '{method_name}' should use camelCase naming")
+            naming.append(f"🔧 Line {i}: Method '{method_name}' should use camelCase naming")
         
         # Variable names should be camelCase
-        var_matches = re.findall(r'(int|String|boolean|double|float|long)\s+([A-Z]\w*)', line_content)
-        for match in var_matches:
+        for match in _VARIABLE_NAME_RE.findall(line_content):
             var_name = match[1]
-            suggestions.append(f"🐍 Line {i}: Variable '{var_name}' should use camelCase naming")
+            naming.append(f"🐍 Line {i}: Variable '{var_name}' should use camelCase naming")
         
         # Constants should be UPPER_CASE
-        const_matches = re.findall(r'final\s+static\s+\w+\s+([a-z]\w*)', line_content)
-        for const_name in const_matches:
-            suggestions.append(f"🔢 Line {i}: Constant '{const_name}' should use UPPER_CASE naming")
+        if 'final' in line_content:
+            for const_name in _CONSTANT_NAME_RE.findall(line_content):
+                naming.append(f"🔢 Line {i}: Constant '{const_name}' should use UPPER_CASE naming")
         
         # Package names should be lowercase
-        package_match = re.search(r'package\s+([^;]*[A-Z][^;]*)', line_content)
+        package_match = 'package' in line_content and _PACKAGE_NAME_RE.search(line_content)
         if package_match:
             package_name = package_match.group(1)
-            suggestions.append(f"📦 Line {i}: Package '{package_name}' should be lowercase")
-    
-    return suggestions
-
-def _check_java_security_performance(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for i, line in enumerate(lines, 1):
-        line_content = line.strip()
+            naming.append(f"📦 Line {i}: Package '{package_name}' should be lowercase")
+        
+        # --- Security and performance ---
         
         # Security issues
-        if 'Runtime.getRuntime().exec' in line_content:
-            suggestions.append(f"🔒 Line {i}: Avoid Runtime.exec() - potential security risk")
+        if has_exec and 'Runtime.getRuntime().exec' in line_content:
+            security.append(f"🔒 Line {i}: Avoid Runtime.exec() - potential security risk")
         
-        if 'Class.forName' in line_content:
-            suggestions.append(f"🔒 Line {i}: Be cautious with Class.forName() - validate input")
+        if has_for_name and 'Class.forName' in line_content:
+            security.append(f"🔒 Line {i}: Be cautious with Class.forName() - validate input")
         
-        if re.search(r'new\s+Random\(\)', line_content):
-            suggestions.append(f"🔒 Line {i}: Use SecureRandom instead of Random for security-sensitive operations")
+        if has_random and 'Random()' in line_content and _NEW_RANDOM_RE.search(line_content):
+            security.append(f"🔒 Line {i}: Use SecureRandom instead of Random for security-sensitive operations")
         
         # Performance issues
-        if '+=' in line_content and 'String' in lines[max(0, i-5):i]:
-            suggestions.append(f"⚡ Line {i}: Use StringBuilder instead of String concatenation in loops")
+        if 'String' in line_content:
+            last_string_line = i
+        # String mentioned on this line or one of the four before it
+        if has_concat and '+=' in line_content and i - last_string_line < 5:
+            security.append(f"⚡ Line {i}: Use StringBuilder instead of String concatenation in loops")
         
-        if '.size()' in line_content and 'for' in line_content:
-            suggestions.append(f"⚡ Line {i}: Cache collection.size() in variable to avoid repeated calls")
+        if has_size and '.size()' in line_content and 'for' in line_content:
+            security.append(f"⚡ Line {i}: Cache collection.size() in variable to avoid repeated calls")
         
-        if 'new String(' in line_content:
-            suggestions.append(f"⚡ Line {i}: Avoid unnecessary String constructor - use string literals")
+        if has_string_ctor and 'new String(' in line_content:
+            security.append(f"⚡ Line {i}: Avoid unnecessary String constructor - use string literals")
         
         # Boxing/Unboxing
-        if re.search(r'new\s+(Integer|Double|Boolean|Float|Long)\(', line_content):
-            suggestions.append(f"⚡ Line {i}: Use valueOf() instead of constructor for wrapper classes")
-    
-    return suggestions
-
-def _check_java_spelling_mistakes(code: str, lines: list) -> list:
-    suggestions = []
-    
-    # Common Java-specific misspellings
-    java_misspellings = {
-        'lenght': 'length',
-        'widht': 'width',
-        'heigh': 'height',
-        'recieve': 'receive',
-        'occured': 'occurred',
-        'seperator': 'separator',
-        'definately': 'definitely',
-        'succesful': 'successful',
-        'proccess': 'process',
-        'adress': 'address',
-        'sucess': 'success',
-        'manger': 'manager',
-        'comparsion': 'comparison',
-        'compatability': 'compatibility',
-        'accesible': 'accessible',
-        'colum': 'column',
-        'usualy': 'usually',
-        'ocasionally': 'occasionally',
-        'excpetion': 'exception',
-        'connexion': 'connection',
-        'initalize': 'initialize',
-        'implmentation': 'implementation'
-    }
-    
-    for i, line in enumerate(lines, 1):
-        # Check comments
-        comment_match = re.search(r'//(.*)|/\*([^*]|\*[^/])*\*/', line)
-        if comment_match:
-            comment_text = comment_match.group(1) or comment_match.group(2) or ""
-            words = re.findall(r'\b[a-zA-Z]+\b', comment_text.lower())
-            for word in words:
-                if word in java_misspellings:
-                    suggestions.append(f"📝 Line {i}: Spelling in comment: '{word}' → '{java_misspellings[word]}'")
-        
-        # Check string literals
-        string_matches = re.findall(r'"([^"]+)"', line)
-        for string_content in string_matches:
-            words = re.findall(r'\b[a-zA-Z]+\b', string_content.lower())
-            for word in words:
-                if word in java_misspellings:
-                    suggestions.append(f"📝 Line {i}: Spelling in string: '{word}' → '{java_misspellings[word]}'")
-        
-        # Check identifiers
-        identifiers = re.findall(r'\b([a-zA-Z_]\w*)\b', line)
-        for identifier in set(identifiers):
-            lower_id = identifier.lower()
-            for misspelling, correction in java_misspellings.items():
-                if misspelling in lower_id:
-                    suggestions.append(f"📝 Line {i}: Identifier '{identifier}' contains '{misspelling}' → '{correction}'")
-    
-    return suggestions
-
-def _check_java_best_practices(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for i, line in enumerate(lines, 1):
-        line_content = line.strip()
+        if 'new' in line_content and _WRAPPER_CTOR_RE.search(line_content):
+            security.append(f"⚡ Line {i}: Use valueOf() instead of constructor for wrapper classes")
+        
+        # --- Spelling ---
+        
+        # Only lines containing a known misspelling can produce a hit
+        if i in misspelled_lines:
+            # Check comments
+            comment_match = _COMMENT_RE.search(line)
+            if comment_match:
+                comment_text = comment_match.group(1) or comment_match.group(2) or ""
+                for word in _words(comment_text):
+                    correction = _JAVA_MISSPELLINGS.get(word)
+                    if correction is not None:
+                        spelling.append(f"📝 Line {i}: Spelling in comment: '{word}' → '{correction}'")
+            
+            # Check string literals
+            for string_content in _STRING_LITERAL_RE.findall(line):
+                for word in _words(string_content):
+                    correction = _JAVA_MISSPELLINGS.get(word)
+                    if correction is not None:
+                        spelling.append(f"📝 Line {i}: Spelling in string: '{word}' → '{correction}'")
+            
+            # Check identifiers
+            for identifier in set(_IDENTIFIER_RE.findall(line)):
+                for misspelling, correction in _SPELLING.in_identifier(identifier.lower()):
+                    spelling.append(f"📝 Line {i}: Identifier '{identifier}' contains '{misspelling}' → '{correction}'")
+            
+        
+        # --- Best practices ---
         
         # Missing @Override annotation
-        if i > 1 and re.search(r'public\s+\w+\s+\w+\s*\(', line_content):
-            prev_line = lines[i-2].strip() if i > 1 else ""
+        if i > 1 and 'public' in line_content and _PUBLIC_METHOD_RE.search(line_content):
             if not prev_line.startswith('@Override'):
                 # Check if it might be overriding (common method names)
-                if re.search(r'(toString|equals|hashCode|compareTo)\s*\(', line_content):
-                    suggestions.append(f"📚 Line {i}: Consider adding @Override annotation")
+                if _OVERRIDE_CANDIDATE_RE.search(line_content):
+                    practices.append(f"📚 Line {i}: Consider adding @Override annotation")
         
         # Missing final keyword for parameters
-        if re.search(r'\([^)]*\w+\s+\w+[^)]*\)', line_content) and 'final' not in line_content:
-            suggestions.append(f"🔧 Line {i}: Consider making parameters final")
+        if ')' in line_content and 'final' not in line_content and _has_typed_parameters(line_content):
+            practices.append(f"🔧 Line {i}: Consider making parameters final")
         
         # Utility class without private constructor
         if 'class' in line_content and 'static' in line_content:
-            suggestions.append(f"🏗️ Line {i}: Utility classes should have private constructor")
+            practices.append(f"🏗️ Line {i}: Utility classes should have private constructor")
         
         # Missing Javadoc for public methods
         if line_content.startswith('public') and '(' in line_content and ')' in line_content:
-            prev_line = lines[i-2].strip() if i > 1 else ""
             if not prev_line.startswith('/**'):
-                suggestions.append(f"📚 Line {i}: Public method missing Javadoc documentation")
+                practices.append(f"📚 Line {i}: Public method missing Javadoc documentation")
         
         # Using Vector instead of ArrayList
-        if 'Vector' in line_content:
-            suggestions.append(f"⚡ Line {i}: Use ArrayList instead of Vector (Vector is synchronized and slower)")
+        if has_vector and 'Vector' in line_content:
+            practices.append(f"⚡ Line {i}: Use ArrayList instead of Vector (Vector is synchronized and slower)")
         
         # Using Hashtable instead of HashMap
-        if 'Hashtable' in line_content:
-            suggestions.append(f"⚡ Line {i}: Use HashMap instead of Hashtable (unless synchronization needed)")
+        if has_hashtable and 'Hashtable' in line_content:
+            practices.append(f"⚡ Line {i}: Use HashMap instead of Hashtable (unless synchronization needed)")
         
         # Interface naming
-        if line_content.startswith('interface') and not re.search(r'interface\s+I[A-Z]', line_content):
-            interface_match = re.search(r'interface\s+(\w+)', line_content)
+        if line_content.startswith('interface') and not _I_PREFIXED_INTERFACE_RE.search(line_content):
+            interface_match = _INTERFACE_NAME_RE.search(line_content)
             if interface_match and interface_match.group(1).startswith('I'):
-                suggestions.append(f"🏗️ Line {i}: Avoid 'I' prefix for interfaces in Java")
+                practices.append(f"🏗️ Line {i}: Avoid 'I' prefix for interfaces in Java")
+        
+        prev_line = line_content
     
-    return suggestions 
\ No newline at end of file
+    # One allocation for the result instead of a temporary per concatenation
+    # A check firing twice for the same line reports once; order is kept
+    return list(dict.fromkeys(chain(code_smells, naming, security, spelling, practices)))
@@ -1,264 +1,317 @@
 import re
+from bisect import bisect_right
+from itertools import chain
+from suggestor._spelling import Misspellings
+
+# Patterns are compiled once at import time and shared by every call
+_VAR_DECL_RE = re.compile(r'\bvar\s+\w+')
+_NO_TRAILING_COMMA_RE = re.compile(r'[\[\{][^[\{\]\}]*[^,\s][\]\}]')
+_NESTED_FUNCTION_RE = re.compile(r'^\s+function\s+\w+')
+_VARIABLE_NAME_RE = re.compile(r'(?:var|let|const)\s+([A-Z]\w*)')
+_FUNCTION_NAME_RE = re.compile(r'function\s+([A-Z]\w*)')
+_CONSTRUCTOR_NAME_RE = re.compile(r'new\s+([a-z]\w*)')
+_CONSTANT_NAME_RE = re.compile(r'const\s+([a-z]\w*)\s*=\s*["\'\d]')
+_THIS_ASSIGN_RE = re.compile(r'this\.([a-zA-Z]\w*)\s*=')
+_THIS_PROPERTY_RE = re.compile(r'this\.([a-zA-Z]\w*)')
+_STRING_TIMEOUT_RE = re.compile(r'setTimeout\s*\(\s*["\']')
+_LENGTH_LOOP_RE = re.compile(r'for\s*\(\s*var\s+\w+\s*=\s*0.*\.length')
+_QUOTE_RE = re.compile(r'["\'`]')
+_COMMENT_RE = re.compile(r'//(.*)|/\*([^*]|\*[^/])*\*/')
+_STRING_LITERAL_RE = re.compile(r'["\']([^"\']+)["\']')
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+_TEMPLATE_LITERAL_RE = re.compile(r'`([^`]+)`')
+_IDENTIFIER_RE = re.compile(r'\b([a-zA-Z_$]\w*)\b')
+_STATEMENT_END_RE = re.compile(r'(var|let|const|return|throw)\s+.*[^;{}\(\),]$')
+_MAGIC_NUMBER_RE = re.compile(r'\b(?!0|1)\d{2,}\b')
+
+# Prefix tuples let startswith test every alternative in one call
+_DECLARATION_PREFIXES = ('var ', 'let ', 'const ')
+_SCOPE_PREFIXES = ('function', 'class', '{', '(')
+
+# Line lengths (longest, and average over the file) beyond which a file is
+# treated as minified rather than hand-written source
+_MINIFIED_MAX_LINE = 2000
+_MINIFIED_AVG_LINE = 500
+
+# Deprecated call patterns paired with the name shown in the suggestion
+_DEPRECATED_METHODS = tuple((method, method.rstrip('(')) for method in ('escape(', 'unescape(', 'with ('))
+
+# Common JavaScript-specific misspellings
+_JS_MISSPELLINGS = {
+    'lenght': 'length',
+    'widht': 'width',
+    'heigh': 'height',
+    'recieve': 'receive',
+    'occured': 'occurred',
+    'seperator': 'separator',
+    'definately': 'definitely',
+    'succesful': 'successful',
+    'proccess': 'process',
+    'adress': 'address',
+    'sucess': 'success',
+    'manger': 'manager',
+    'comparsion': 'comparison',
+    'compatability': 'compatibility',
+    'accesible': 'accessible',
+    'colum': 'column',
+    'usualy': 'usually',
+    'ocasionally': 'occasionally',
+    'fucntion': 'function',
+    'retrun': 'return',
+    'calback': 'callback',
+    'asyncronous': 'asynchronous',
+    'promiss': 'promise',
+    'reponse': 'response',
+    'requets': 'request'
+}
+
+_SPELLING = Misspellings(_JS_MISSPELLINGS)
 
 def suggest_refactor_javascript(code: str) -> list:
     """
     Analyze JavaScript code and provide refactoring suggestions with line numbers.
     """
-    suggestions = []
     lines = code.split('\n')
     
-    # JavaScript-specific checks
-    suggestions.extend(_check_js_code_smells(code, lines))
-    suggestions.extend(_check_js_naming_conventions(code, lines))
-    suggestions.extend(_check_js_security_performance(code, lines))
-    suggestions.extend(_check_js_spelling_mistakes(code, lines))
-    suggestions.extend(_check_js_best_practices(code, lines))
+    # Minified bundles and binary data would trip nearly every check on each
+    # huge line, producing a slow and useless wall of suggestions
+    if '\x00' in code:
+        return ["⚠️ File appears to be binary - no suggestions generated"]
+    if max(map(len, lines)) > _MINIFIED_MAX_LINE or len(code) / len(lines) > _MINIFIED_AVG_LINE:
+        return ["⚠️ File appears to be minified - no suggestions generated, analyze the unminified source instead"]
     
-    return suggestions
+    # JavaScript-specific checks
+    return _check_all_js(code, lines)
 
-def _check_js_code_smells(code: str, lines: list) -> list:
-    suggestions = []
+def _check_all_js(code: str, lines: list) -> list:
+    """Run every JavaScript check in one pass over the lines of a file already screened as non-minified"""
+    code_smells = []
+    naming = []
+    security = []
+    spelling = []
+    practices = []
+    misspelled_lines = _SPELLING.lines(code)
+    
+    # Whole-file facts used by per-line checks, computed once
+    has_for = 'for' in code
+    has_bracket = '[' in code
+    # Rare triggers: one C-level scan of the file lets absent ones skip every line
+    has_console_log = 'console.log' in code
+    has_eval = 'eval(' in code
+    has_inner_html = 'innerHTML' in code
+    has_document_write = 'document.write' in code
+    has_get_element = has_for and 'document.getElementById' in code
+    has_xhr = 'XMLHttpRequest' in code
+    has_listener = 'addEventListener' in code
+    last_catch = code.rfind('.catch(')
+    # Lines mentioning 'var ', searched by the function-scope check
+    var_lines = [n for n, text in enumerate(lines, 1) if 'var ' in text] if 'var ' in code else []
+    
+    # State carried forward instead of rescanning earlier lines
+    scope_seen = False  # a scope opener appeared on an earlier line
+    last_jsdoc_line = -2  # most recent line containing '/**'
     
     for i, line in enumerate(lines, 1):
         line_content = line.strip()
+        line_length = len(line)
         
-        # == vs === comparison
-        if '==' in line_content and '===' not in line_content and '!=' in line_content:
-            suggestions.append(f"🔧 Line {i}: Use strict equality (===) instead of loose equality (==)")
+        # --- Code smells ---
         
-        if '!=' in line_content and '!==' not in line_content:
-            suggestions.append(f"🔧 Line {i}: Use strict inequality (!==) instead of loose inequality (!=)")
+        # == vs === comparison: each operator count is one C-level scan, and
+        # occurrences inside === or !== are subtracted out
+        if '=' in line_content:
+            strict_inequalities = line_content.count('!==')
+            if line_content.count('==') > line_content.count('===') + strict_inequalities:
+                code_smells.append(f"🔧 Line {i}: Use strict equality (===) instead of loose equality (==)")
+            
+            if line_content.count('!=') > strict_inequalities:
+                code_smells.append(f"🔧 Line {i}: Use strict inequality (!==) instead of loose inequality (!=)")
         
         # console.log in production
-        if 'console.log' in line_content:
-            suggestions.append(f"🚫 Line {i}: Remove console.log statements in production code")
+        if has_console_log and 'console.log' in line_content:
+            code_smells.append(f"🚫 Line {i}: Remove console.log statements in production code")
         
         # var instead of let/const
-        if re.search(r'\bvar\s+\w+', line_content):
-            suggestions.append(f"🔧 Line {i}: Use 'let' or 'const' instead of 'var'")
+        if 'var' in line_content and _VAR_DECL_RE.search(line_content):
+            code_smells.append(f"🔧 Line {i}: Use 'let' or 'const' instead of 'var'")
         
         # Global variables
-        if line_content.startswith('var ') or line_content.startswith('let ') or line_content.startswith('const '):
-            if i == 1 or not any(line.strip().startswith(('function', 'class', '{', '(')) for line in lines[:i-1]):
-                suggestions.append(f"🌐 Line {i}: Avoid global variables - use modules or IIFE")
+        if not scope_seen:
+            if line_content.startswith(_DECLARATION_PREFIXES):
+                code_smells.append(f"🌐 Line {i}: Avoid global variables - use modules or IIFE")
+            scope_seen = line_content.startswith(_SCOPE_PREFIXES)
         
         # Long lines
-        if len(line) > 100:
-            suggestions.append(f"📏 Line {i}: Line too long ({len(line)} chars) - consider breaking it down")
+        if line_length > 100:
+            code_smells.append(f"📏 Line {i}: Line too long ({line_length} chars) - consider breaking it down")
         
         # Empty catch blocks
         if 'catch' in line_content and '{' in line_content:
             next_lines = lines[i:i+3] if i < len(lines) - 2 else []
-            if any('}' in next_line.strip() and len(next_line.strip()) <= 1 for next_line in next_lines):
-                suggestions.append(f"🚫 Line {i}: Empty catch block - handle errors properly")
+            if any(next_line.strip() == '}' for next_line in next_lines):
+                code_smells.append(f"🚫 Line {i}: Empty catch block - handle errors properly")
         
         # eval() usage
-        if 'eval(' in line_content:
-            suggestions.append(f"🔒 Line {i}: Avoid eval() - it's a security risk and performance issue")
+        if has_eval and 'eval(' in line_content:
+            code_smells.append(f"🔒 Line {i}: Avoid eval() - it's a security risk and performance issue")
         
         # Trailing commas in objects/arrays (good practice in modern JS)
-        if re.search(r'[\[\{][^[\{\]\}]*[^,\s][\]\}]', line_content):
-            suggestions.append(f"📝 Line {i}: Consider adding trailing commas for better diffs")
+        if _NO_TRAILING_COMMA_RE.search(line_content):
+            code_smells.append(f"📝 Line {i}: Consider adding trailing commas for better diffs")
         
         # Function declarations inside blocks
-        if re.search(r'^\s+function\s+\w+', line_content):
-            suggestions.append(f"🔧 Line {i}: Avoid function declarations inside blocks - use function expressions")
-    
-    return suggestions
-
-def _check_js_naming_conventions(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for i, line in enumerate(lines, 1):
-        line_content = line.strip()
+        if 'function' in line_content and _NESTED_FUNCTION_RE.search(line_content):
+            code_smells.append(f"🔧 Line {i}: Avoid function declarations inside blocks - use function expressions")
+        
+        # --- Naming conventions ---
         
         # Variable names should be camelCase
-        var_matches = re.findall(r'(?:var|let|const)\s+([A-Z]\w*)', line_content)
+        var_matches = _VARIABLE_NAME_RE.findall(line_content)
         for var_name in var_matches:
-            suggestions.append(f"🐍 Line {i}: Variable '{var_name}' should use camelCase naming")
+            naming.append(f"🐍 Line {i}: Variable '{var_name}' should use camelCase naming")
         
         # Function names should be camelCase
-        func_matches = re.findall(r'function\s+([A-Z]\w*)', line_content)
-        for func_name in func_matches:
-            suggestions.append(f"🔧 Line {i}: Function '{func_name}' should use camelCase naming")
+        if 'function' in line_content:
+            func_matches = _FUNCTION_NAME_RE.findall(line_content)
+            for func_name in func_matches:
+                naming.append(f"🔧 Line {i}: Function '{func_name}' should use camelCase naming")
         
         # Constructor functions should be PascalCase
-        new_matches = re.findall(r'new\s+([a-z]\w*)', line_content)
-        for constructor in new_matches:
-            suggestions.append(f"🏗️ Line {i}: Constructor '{constructor}' should use PascalCase naming")
+        if 'new' in line_content:
+            new_matches = _CONSTRUCTOR_NAME_RE.findall(line_content)
+            for constructor in new_matches:
+                naming.append(f"🏗️ Line {i}: Constructor '{constructor}' should use PascalCase naming")
         
         # Constants should be UPPER_CASE
-        const_matches = re.findall(r'const\s+([a-z]\w*)\s*=\s*["\'\d]', line_content)
-        for const_name in const_matches:
-            suggestions.append(f"🔢 Line {i}: Constant '{const_name}' should use UPPER_CASE naming")
+        if 'const' in line_content:
+            const_matches = _CONSTANT_NAME_RE.findall(line_content)
+            for const_name in const_matches:
+                naming.append(f"🔢 Line {i}: Constant '{const_name}' should use UPPER_CASE naming")
         
         # Private methods/properties (convention: underscore prefix)
-        if re.search(r'this\.([a-zA-Z]\w*)\s*=', line_content):
-            prop_name = re.search(r'this\.([a-zA-Z]\w*)', line_content).group(1)
+        if 'this.' in line_content and _THIS_ASSIGN_RE.search(line_content):
+            prop_name = _THIS_PROPERTY_RE.search(line_content).group(1)
             if not prop_name.startswith('_') and 'private' in line_content.lower():
-                suggestions.append(f"🔒 Line {i}: Private property '{prop_name}' should start with underscore")
-    
-    return suggestions
-
-def _check_js_security_performance(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for i, line in enumerate(lines, 1):
-        line_content = line.strip()
+                naming.append(f"🔒 Line {i}: Private property '{prop_name}' should start with underscore")
+        
+        # --- Security and performance ---
         
         # Security issues
-        if 'innerHTML' in line_content and '=' in line_content:
-            suggestions.append(f"🔒 Line {i}: Using innerHTML can lead to XSS - consider textContent or sanitization")
+        if has_inner_html and 'innerHTML' in line_content and '=' in line_content:
+            security.append(f"🔒 Line {i}: Using innerHTML can lead to XSS - consider textContent or sanitization")
         
-        if 'document.write' in line_content:
-            suggestions.append(f"🔒 Line {i}: Avoid document.write - it can overwrite the entire document")
+        if has_document_write and 'document.write' in line_content:
+            security.append(f"🔒 Line {i}: Avoid document.write - it can overwrite the entire document")
         
         if 'setTimeout' in line_content and 'string' in str(type(line_content)):
-            if re.search(r'setTimeout\s*\(\s*["\']', line_content):
-                suggestions.append(f"🔒 Line {i}: Avoid string-based setTimeout - use functions instead")
+            if _STRING_TIMEOUT_RE.search(line_content):
+                security.append(f"🔒 Line {i}: Avoid string-based setTimeout - use functions instead")
         
         # Performance issues
-        if 'document.getElementById' in line_content and 'for' in code:
-            suggestions.append(f"⚡ Line {i}: Cache DOM elements outside loops to improve performance")
+        if has_get_element and 'document.getElementById' in line_content:
+            security.append(f"⚡ Line {i}: Cache DOM elements outside loops to improve performance")
         
-        if re.search(r'for\s*\(\s*var\s+\w+\s*=\s*0.*\.length', line_content):
-            suggestions.append(f"⚡ Line {i}: Cache array length in variable to avoid repeated access")
+        if '.length' in line_content and _LENGTH_LOOP_RE.search(line_content):
+            security.append(f"⚡ Line {i}: Cache array length in variable to avoid repeated access")
         
-        if '+=' in line_content and re.search(r'["\'`]', line_content):
-            suggestions.append(f"⚡ Line {i}: Use template literals or array.join() for string concatenation")
+        if '+=' in line_content and _QUOTE_RE.search(line_content):
+            security.append(f"⚡ Line {i}: Use template literals or array.join() for string concatenation")
         
         # Synchronous AJAX
-        if 'XMLHttpRequest' in line_content and 'false' in line_content:
-            suggestions.append(f"⚡ Line {i}: Avoid synchronous AJAX - use async requests")
+        if has_xhr and 'XMLHttpRequest' in line_content and 'false' in line_content:
+            security.append(f"⚡ Line {i}: Avoid synchronous AJAX - use async requests")
         
         # Memory leaks
-        if 'addEventListener' in line_content:
-            suggestions.append(f"💾 Line {i}: Remember to remove event listeners to prevent memory leaks")
-    
-    return suggestions
-
-def _check_js_spelling_mistakes(code: str, lines: list) -> list:
-    suggestions = []
-    
-    # Common JavaScript-specific misspellings
-    js_misspellings = {
-        'lenght': 'length',
-        'widht': 'width',
-        'heigh': 'height',
-        'recieve': 'receive',
-        'occured': 'occurred',
-        'seperator': 'separator',
-        'definately': 'definitely',
-        'succesful': 'successful',
-        'proccess': 'process',
-        'adress': 'address',
-        'sucess': 'success',
-        'manger': 'manager',
-        'comparsion': 'comparison',
-        'compatability': 'compatibility',
-        'accesible': 'accessible',
-        'colum': 'column',
-        'usualy': 'usually',
-        'ocasionally': 'occasionally',
-        'fucntion': 'function',
-        'retrun': 'return',
-        'calback': 'callback',
-        'asyncronous': 'asynchronous',
-        'promiss': 'promise',
-        'reponse': 'response',
-        'requets': 'request'
-    }
-    
-    for i, line in enumerate(lines, 1):
-        # Check comments
-        comment_match = re.search(r'//(.*)|/\*([^*]|\*[^/])*\*/', line)
-        if comment_match:
-            comment_text = comment_match.group(1) or comment_match.group(2) or ""
-            words = re.findall(r'\b[a-zA-Z]+\b', comment_text.lower())
-            for word in words:
-                if word in js_misspellings:
-                    suggestions.append(f"📝 Line {i}: Spelling in comment: '{word}' → '{js_misspellings[word]}'")
-        
-        # Check string literals
-        string_matches = re.findall(r'["\']([^"\']+)["\']', line)
-        for string_content in string_matches:
-            words = re.findall(r'\b[a-zA-Z]+\b', string_content.lower())
-            for word in words:
-                if word in js_misspellings:
-                    suggestions.append(f"📝 Line {i}: Spelling in string: '{word}' → '{js_misspellings[word]}'")
-        
-        # Check template literals
-        template_matches = re.findall(r'`([^`]+)`', line)
-        for template_content in template_matches:
-            words = re.findall(r'\b[a-zA-Z]+\b', template_content.lower())
-            for word in words:
-                if word in js_misspellings:
-                    suggestions.append(f"📝 Line {i}: Spelling in template: '{word}' → '{js_misspellings[word]}'")
-        
-        # Check identifiers
-        identifiers = re.findall(r'\b([a-zA-Z_$]\w*)\b', line)
-        for identifier in set(identifiers):
-            lower_id = identifier.lower()
-            for misspelling, correction in js_misspellings.items():
-                if misspelling in lower_id:
-                    suggestions.append(f"📝 Line {i}: Identifier '{identifier}' contains '{misspelling}' → '{correction}'")
-    
-    return suggestions
-
-def _check_js_best_practices(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for i, line in enumerate(lines, 1):
-        line_content = line.strip()
+        if has_listener and 'addEventListener' in line_content:
+            security.append(f"💾 Line {i}: Remember to remove event listeners to prevent memory leaks")
+        
+        # --- Spelling ---
+        
+        # Only lines containing a known misspelling can produce a hit
+        if i in misspelled_lines:
+            # Check comments
+            comment_match = _COMMENT_RE.search(line)
+            if comment_match:
+                comment_text = comment_match.group(1) or comment_match.group(2) or ""
+                words = _WORD_RE.findall(comment_text.lower())
+                for word in words:
+                    correction = _JS_MISSPELLINGS.get(word)
+                    if correction is not None:
+                        spelling.append(f"📝 Line {i}: Spelling in comment: '{word}' → '{correction}'")
+            
+            # Check string literals
+            string_matches = _STRING_LITERAL_RE.findall(line)
+            for string_content in string_matches:
+                words = _WORD_RE.findall(string_content.lower())
+                for word in words:
+                    correction = _JS_MISSPELLINGS.get(word)
+                    if correction is not None:
+                        spelling.append(f"📝 Line {i}: Spelling in string: '{word}' → '{correction}'")
+            
+            # Check template literals
+            template_matches = _TEMPLATE_LITERAL_RE.findall(line)
+            for template_content in template_matches:
+                words = _WORD_RE.findall(template_content.lower())
+                for word in words:
+                    correction = _JS_MISSPELLINGS.get(word)
+                    if correction is not None:
+                        spelling.append(f"📝 Line {i}: Spelling in template: '{word}' → '{correction}'")
+            
+            # Check identifiers
+            identifiers = _IDENTIFIER_RE.findall(line)
+            for identifier in set(identifiers):
+                for misspelling, correction in _SPELLING.in_identifier(identifier.lower()):
+                    spelling.append(f"📝 Line {i}: Identifier '{identifier}' contains '{misspelling}' → '{correction}'")
+        
+        # --- Best practices ---
         
         # Missing semicolons
         if line_content and not line_content.endswith((';', '{', '}', ')', ',')):
-            if re.search(r'(var|let|const|return|throw)\s+.*[^;{}\(\),]$', line_content):
-                suggestions.append(f"📝 Line {i}: Consider adding semicolon at end of statement")
+            if _STATEMENT_END_RE.search(line_content):
+                practices.append(f"📝 Line {i}: Consider adding semicolon at end of statement")
         
         # Using == null instead of === null
         if '== null' in line_content:
-            suggestions.append(f"🔧 Line {i}: Use '=== null' instead of '== null'")
+            practices.append(f"🔧 Line {i}: Use '=== null' instead of '== null'")
         
         # Array/Object method chaining without proper formatting
         if line_content.count('.') > 2 and len(line_content) > 60:
-            suggestions.append(f"📝 Line {i}: Consider breaking method chains across multiple lines")
+            practices.append(f"📝 Line {i}: Consider breaking method chains across multiple lines")
         
         # Missing JSDoc for functions
-        if line_content.startswith('function') or 'function' in line_content:
-            prev_lines = lines[max(0, i-3):i-1]
-            if not any('/**' in prev_line for prev_line in prev_lines):
-                suggestions.append(f"📚 Line {i}: Consider adding JSDoc documentation for function")
+        if 'function' in line_content and last_jsdoc_line < i - 2:
+            practices.append(f"📚 Line {i}: Consider adding JSDoc documentation for function")
+        if '/**' in line:
+            last_jsdoc_line = i
         
         # Using for...in for arrays
-        if 'for' in line_content and 'in' in line_content and '[' in code:
-            suggestions.append(f"🔧 Line {i}: Use for...of or forEach for arrays instead of for...in")
+        if has_bracket and 'for' in line_content and 'in' in line_content:
+            practices.append(f"🔧 Line {i}: Use for...of or forEach for arrays instead of for...in")
         
         # Nested callbacks (callback hell)
-        indentation_level = len(line_content) - len(line_content.lstrip())
+        indentation_level = line_length - len(line.lstrip())
         if indentation_level > 12 and 'function' in line_content:
-            suggestions.append(f"🔧 Line {i}: Deep nesting detected - consider using Promises or async/await")
+            practices.append(f"🔧 Line {i}: Deep nesting detected - consider using Promises or async/await")
         
         # Using var in function scope
         if 'function' in line_content and i < len(lines) - 1:
-            next_lines = lines[i:i+10]
-            for j, next_line in enumerate(next_lines):
-                if 'var ' in next_line:
-                    suggestions.append(f"🔧 Line {i+j+1}: Use 'let' or 'const' instead of 'var' in function scope")
-                    break
+            # First 'var ' line among the next ten
+            k = bisect_right(var_lines, i)
+            if k < len(var_lines) and var_lines[k] <= i + 10:
+                practices.append(f"🔧 Line {var_lines[k]}: Use 'let' or 'const' instead of 'var' in function scope")
         
         # Magical numbers
-        if re.search(r'\b(?!0|1)\d{2,}\b', line_content) and not line_content.strip().startswith('//'):
-            suggestions.append(f"📏 Line {i}: Consider using named constants instead of magic numbers")
+        if _MAGIC_NUMBER_RE.search(line_content) and not line_content.startswith('//'):
+            practices.append(f"📏 Line {i}: Consider using named constants instead of magic numbers")
         
-        # Promises without error handling
-        if '.then(' in line_content and '.catch(' not in code[code.find(line_content):]:
-            suggestions.append(f"⚠️ Line {i}: Promise chain missing error handling (.catch)")
+        # Promises without error handling (no .catch( from the first occurrence of this line's text on)
+        if '.then(' in line_content and code.find(line_content, 0, last_catch + len(line_content)) == -1:
+            practices.append(f"⚠️ Line {i}: Promise chain missing error handling (.catch)")
         
         # Using deprecated methods
-        deprecated_methods = ['escape(', 'unescape(', 'with (']
-        for method in deprecated_methods:
+        for method, name in _DEPRECATED_METHODS:
             if method in line_content:
-                suggestions.append(f"⚠️ Line {i}: '{method.rstrip('(')}' is deprecated - use modern alternatives")
+                practices.append(f"⚠️ Line {i}: '{name}' is deprecated - use modern alternatives")
     
-    return suggestions 
\ No newline at end of file
+    # A check firing twice for the same line reports once; order is kept
+    return list(dict.fromkeys(chain(code_smells, naming, security, spelling, practices)))
@@ -1,21 +1,52 @@
 import re
 import ast
+from itertools import chain
+from suggestor._spelling import Misspellings
+
+# Patterns are compiled once at import time and shared by every call
+_MULTI_IMPORT_RE = re.compile(r'import\s+\w+\s*,')
+_BARE_EXCEPT_RE = re.compile(r'except\s*:')
+_LIST_DEFAULT_RE = re.compile(r'def\s+\w+\([^)]*=\s*\[\]')
+_DICT_DEFAULT_RE = re.compile(r'def\s+\w+\([^)]*=\s*\{\}')
+_GLOBAL_RE = re.compile(r'^global\s+\w+')
+_FUNCTION_NAME_RE = re.compile(r'def\s+([A-Z]\w*)')
+_CLASS_NAME_RE = re.compile(r'class\s+([a-z]\w*)')
+_CONSTANT_NAME_RE = re.compile(r'^([a-z]\w*)\s*=\s*[\'\"]\w+[\'\"]\s*$')
+_RANGE_LEN_RE = re.compile(r'for\s+\w+\s+in\s+range\(len\(')
+_COMMENT_RE = re.compile(r'#\s*(.+)')
+_STRING_LITERAL_RE = re.compile(r'["\']([^"\']+)["\']')
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+_IDENTIFIER_RE = re.compile(r'\b([a-zA-Z_]\w*)\b')
+
+# Common misspellings in variable names and comments
+_COMMON_MISSPELLINGS = {
+    'lenght': 'length',
+    'widht': 'width',
+    'heigh': 'height',
+    'recieve': 'receive',
+    'occured': 'occurred',
+    'seperator': 'separator',
+    'definately': 'definitely',
+    'succesful': 'successful',
+    'proccess': 'process',
+    'adress': 'address',
+    'sucess': 'success',
+    'manger': 'manager',
+    'comparsion': 'comparison',
+    'compatability': 'compatibility',
+    'accesible': 'accessible',
+    'colum': 'column',
+    'usualy': 'usually',
+    'ocasionally': 'occasionally'
+}
+
+_SPELLING = Misspellings(_COMMON_MISSPELLINGS)
 
 def suggest_refactor(code: str) -> list:
-    suggestions = []
     lines = code.split('\n')
     
-    # Code smell and best practice checks
-    suggestions.extend(_check_code_smells(code, lines))
-    
-    # Naming convention checks
-    suggestions.extend(_check_naming_conventions(code, lines))
-    
-    # Security and performance suggestions
-    suggestions.extend(_check_security_performance(code, lines))
-    
-    # Spelling mistakes in comments and strings
-    suggestions.extend(_check_spelling_mistakes(code, lines))
+    # Line-based checks: code smells, naming, security/performance and spelling
+    suggestions = _check_all_python(code, lines)
     
     # AST-based checks
     try:
@@ -24,151 +55,159 @@ def suggest_refactor(code: str) -> list:
     except SyntaxError:
         suggestions.append("⚠️ Syntax error detected - code cannot be parsed")
     
-    return suggestions
+    # A check firing twice for the same line reports once; order is kept
+    return list(dict.fromkeys(suggestions))
 
-def _check_code_smells(code: str, lines: list) -> list:
-    suggestions = []
+def _check_all_python(code: str, lines: list) -> list:
+    """Run the line-based Python checks in one pass; _check_ast_issues covers the rest"""
+    code_smells = []
+    naming = []
+    security = []
+    spelling = []
+    misspelled_lines = _SPELLING.lines(code)
+    
+    # Rare triggers: one C-level scan of the file lets absent ones skip every line
+    has_eval = 'eval(' in code
+    has_exec = 'exec(' in code
+    has_range_len = 'range(len(' in code
     
     for line_num, line in enumerate(lines, 1):
+        # --- Code smells ---
+        
         # Basic code smells
         if "==" in line and "None" in line:
-            suggestions.append(f"🔧 Line {line_num}: Use 'is None' instead of '== None' for None comparisons")
+            code_smells.append(f"🔧 Line {line_num}: Use 'is None' instead of '== None' for None comparisons")
         
         if "!=" in line and "None" in line:
-            suggestions.append(f"🔧 Line {line_num}: Use 'is not None' instead of '!= None' for None comparisons")
+            code_smells.append(f"🔧 Line {line_num}: Use 'is not None' instead of '!= None' for None comparisons")
         
         if "print(" in line:
-            suggestions.append(f"🚫 Line {line_num}: Avoid using print statements in production code - use logging instead")
+            code_smells.append(f"🚫 Line {line_num}: Avoid using print statements in production code - use logging instead")
         
         # Long lines
-        if len(line) > 100:
-            suggestions.append(f"📏 Line {line_num}: Line is too long ({len(line)} chars) - consider breaking it down")
+        line_length = len(line)
+        if line_length > 100:
+            code_smells.append(f"📏 Line {line_num}: Line is too long ({line_length} chars) - consider breaking it down")
         
         # Multiple imports on one line
-        if re.search(r'import\s+\w+\s*,', line):
-            suggestions.append(f"📦 Line {line_num}: Use separate import statements for better readability")
+        if 'import' in line and _MULTI_IMPORT_RE.search(line):
+            code_smells.append(f"📦 Line {line_num}: Use separate import statements for better readability")
         
         # Bare except clauses
-        if re.search(r'except\s*:', line):
-            suggestions.append(f"⚠️ Line {line_num}: Avoid bare 'except:' clauses - specify exception types")
+        if 'except' in line and _BARE_EXCEPT_RE.search(line):
+            code_smells.append(f"⚠️ Line {line_num}: Avoid bare 'except:' clauses - specify exception types")
         
         # Mutable default arguments
-        if re.search(r'def\s+\w+\([^)]*=\s*\[\]', line):
-            suggestions.append(f"🐛 Line {line_num}: Avoid mutable default arguments (list) - use None instead")
+        if '[]' in line and _LIST_DEFAULT_RE.search(line):
+            code_smells.append(f"🐛 Line {line_num}: Avoid mutable default arguments (list) - use None instead")
         
-        if re.search(r'def\s+\w+\([^)]*=\s*\{\}', line):
-            suggestions.append(f"🐛 Line {line_num}: Avoid mutable default arguments (dict) - use None instead")
+        if '{}' in line and _DICT_DEFAULT_RE.search(line):
+            code_smells.append(f"🐛 Line {line_num}: Avoid mutable default arguments (dict) - use None instead")
         
         # Global variables
-        if re.search(r'^global\s+\w+', line):
-            suggestions.append(f"🌐 Line {line_num}: Avoid using global variables - consider class attributes or function parameters")
-    
-    return suggestions
-
-def _check_naming_conventions(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for line_num, line in enumerate(lines, 1):
+        if line.startswith('global') and _GLOBAL_RE.search(line):
+            code_smells.append(f"🌐 Line {line_num}: Avoid using global variables - consider class attributes or function parameters")
+        
+        # --- Naming conventions ---
+        
         # Function names should be snake_case
-        func_matches = re.findall(r'def\s+([A-Z]\w*)', line)
-        for func in func_matches:
-            suggestions.append(f"🐍 Line {line_num}: Function '{func}' should use snake_case naming convention")
+        if 'def' in line:
+            func_matches = _FUNCTION_NAME_RE.findall(line)
+            for func in func_matches:
+                naming.append(f"🐍 Line {line_num}: Function '{func}' should use snake_case naming convention")
         
         # Class names should be PascalCase
-        class_matches = re.findall(r'class\s+([a-z]\w*)', line)
-        for cls in class_matches:
-            suggestions.append(f"🏗️ Line {line_num}: Class '{cls}' should use PascalCase naming convention")
+        if 'class' in line:
+            class_matches = _CLASS_NAME_RE.findall(line)
+            for cls in class_matches:
+                naming.append(f"🏗️ Line {line_num}: Class '{cls}' should use PascalCase naming convention")
         
         # Constants should be UPPER_CASE
-        const_matches = re.findall(r'^([a-z]\w*)\s*=\s*[\'\"]\w+[\'\"]\s*$', line)
-        for const in const_matches:
-            suggestions.append(f"🔢 Line {line_num}: Constant '{const}' should use UPPER_CASE naming convention")
-    
-    return suggestions
-
-def _check_security_performance(code: str, lines: list) -> list:
-    suggestions = []
-    
-    for line_num, line in enumerate(lines, 1):
+        if '=' in line:
+            const_matches = _CONSTANT_NAME_RE.findall(line)
+            for const in const_matches:
+                naming.append(f"🔢 Line {line_num}: Constant '{const}' should use UPPER_CASE naming convention")
+        
+        # --- Security and performance ---
+        
         # Security issues
-        if 'eval(' in line:
-            suggestions.append(f"🔒 Line {line_num}: Avoid using eval() - it's a security risk")
+        if has_eval and 'eval(' in line:
+            security.append(f"🔒 Line {line_num}: Avoid using eval() - it's a security risk")
         
-        if 'exec(' in line:
-            suggestions.append(f"🔒 Line {line_num}: Avoid using exec() - it's a security risk")
+        if has_exec and 'exec(' in line:
+            security.append(f"🔒 Line {line_num}: Avoid using exec() - it's a security risk")
         
         if 'input(' in line and 'int(' in line:
-            suggestions.append(f"🔒 Line {line_num}: Validate user input before converting to int")
+            security.append(f"🔒 Line {line_num}: Validate user input before converting to int")
         
         # Performance suggestions
         if '+=' in line and 'str' in line:
-            suggestions.append(f"⚡ Line {line_num}: For string concatenation in loops, consider using join() or f-strings")
+            security.append(f"⚡ Line {line_num}: For string concatenation in loops, consider using join() or f-strings")
         
-        if re.search(r'for\s+\w+\s+in\s+range\(len\(', line):
-            suggestions.append(f"⚡ Line {line_num}: Consider using enumerate() instead of range(len())")
+        if has_range_len and 'range(len(' in line and _RANGE_LEN_RE.search(line):
+            security.append(f"⚡ Line {line_num}: Consider using enumerate() instead of range(len())")
         
         if '.keys()' in line and 'in ' in line:
-            suggestions.append(f"⚡ Line {line_num}: Use 'key in dict' instead of 'key in dict.keys()'")
-    
-    return suggestions
+            security.append(f"⚡ Line {line_num}: Use 'key in dict' instead of 'key in dict.keys()'")
+        
+        # --- Spelling ---
+        
+        # Only lines containing a known misspelling can produce a hit
+        if line_num in misspelled_lines:
+            # Check comments for spelling mistakes
+            comment_match = _COMMENT_RE.search(line)
+            if comment_match:
+                comment_text = comment_match.group(1)
+                words = _WORD_RE.findall(comment_text.lower())
+                for word in words:
+                    correction = _COMMON_MISSPELLINGS.get(word)
+                    if correction is not None:
+                        spelling.append(f"📝 Line {line_num}: Spelling in comment: '{word}' might be misspelled, did you mean '{correction}'?")
+            
+            # Check string literals for spelling mistakes
+            string_matches = _STRING_LITERAL_RE.findall(line)
+            for string_content in string_matches:
+                words = _WORD_RE.findall(string_content.lower())
+                for word in words:
+                    correction = _COMMON_MISSPELLINGS.get(word)
+                    if correction is not None:
+                        spelling.append(f"📝 Line {line_num}: Spelling in string: '{word}' might be misspelled, did you mean '{correction}'?")
+            
+            # Check variable and function names for common misspellings
+            identifiers = _IDENTIFIER_RE.findall(line)
+            for identifier in set(identifiers):  # Remove duplicates
+                for misspelling, correction in _SPELLING.in_identifier(identifier.lower()):
+                    spelling.append(f"📝 Line {line_num}: Variable/function name '{identifier}' contains potential misspelling: '{misspelling}' → '{correction}'")
+    
+    return list(chain(code_smells, naming, security, spelling))
 
-def _check_spelling_mistakes(code: str, lines: list) -> list:
-    suggestions = []
-    
-    # Common misspellings in variable names and comments
-    common_misspellings = {
-        'lenght': 'length',
-        'widht': 'width',
-        'heigh': 'height',
-        'recieve': 'receive',
-        'occured': 'occurred',
-        'seperator': 'separator',
-        'definately': 'definitely',
-        'succesful': 'successful',
-        'proccess': 'process',
-        'adress': 'address',
-        'sucess': 'success',
-        'manger': 'manager',
-        'comparsion': 'comparison',
-        'compatability': 'compatibility',
-        'accesible': 'accessible',
-        'colum': 'column',
-        'usualy': 'usually',
-        'ocasionally': 'occasionally'
-    }
-    
-    for line_num, line in enumerate(lines, 1):
-        # Check comments for spelling mistakes
-        comment_match = re.search(r'#\s*(.+)', line)
-        if comment_match:
-            comment_text = comment_match.group(1)
-            words = re.findall(r'\b[a-zA-Z]+\b', comment_text.lower())
-            for word in words:
-                if word in common_misspellings:
-                    suggestions.append(f"📝 Line {line_num}: Spelling in comment: '{word}' might be misspelled, did you mean '{common_misspellings[word]}'?")
-        
-        # Check string literals for spelling mistakes
-        string_matches = re.findall(r'["\']([^"\']+)["\']', line)
-        for string_content in string_matches:
-            words = re.findall(r'\b[a-zA-Z]+\b', string_content.lower())
-            for word in words:
-                if word in common_misspellings:
-                    suggestions.append(f"📝 Line {line_num}: Spelling in string: '{word}' might be misspelled, did you mean '{common_misspellings[word]}'?")
-        
-        # Check variable and function names for common misspellings
-        identifiers = re.findall(r'\b([a-zA-Z_]\w*)\b', line)
-        for identifier in set(identifiers):  # Remove duplicates
-            lower_id = identifier.lower()
-            for misspelling, correction in common_misspellings.items():
-                if misspelling in lower_id:
-                    suggestions.append(f"📝 Line {line_num}: Variable/function name '{identifier}' contains potential misspelling: '{misspelling}' → '{correction}'")
-    
-    return suggestions
+_NESTING_NODES = (ast.If, ast.For, ast.While, ast.With, ast.Try)
 
 def _check_ast_issues(tree) -> list:
     suggestions = []
     
-    for node in ast.walk(tree):
+    # Flatten the tree breadth-first, the order ast.walk visits it, keeping
+    # each node's parent index. Expressions cannot contain statements, so
+    # their subtrees are skipped; the remaining nodes keep their order.
+    nodes = [tree]
+    parents = [-1]
+    index = 0
+    while index < len(nodes):
+        for child in ast.iter_child_nodes(nodes[index]):
+            if not isinstance(child, ast.expr):
+                nodes.append(child)
+                parents.append(index)
+        index += 1
+    
+    # Every node comes after its parent, so sweeping backwards settles a
+    # block's nesting depth before it is passed up to the enclosing block
+    depths = [0] * len(nodes)
+    for index in range(len(nodes) - 1, 0, -1):
+        if isinstance(nodes[index], _NESTING_NODES):
+            parent = parents[index]
+            depths[parent] = max(depths[parent], depths[index] + 1)
+    
+    for node, depth in zip(nodes, depths):
         # Check for functions without docstrings
         if isinstance(node, ast.FunctionDef) and not ast.get_docstring(node):
             line_num = getattr(node, 'lineno', 'unknown')
@@ -185,19 +224,8 @@ def _check_ast_issues(tree) -> list:
             suggestions.append(f"🔧 Line {line_num}: Function '{node.name}' has too many parameters ({len(node.args.args)}) - consider refactoring")
         
         # Check for deeply nested code
-        if isinstance(node, (ast.If, ast.For, ast.While, ast.With)):
-            depth = _get_nesting_depth(node)
-            if depth > 3:
-                line_num = getattr(node, 'lineno', 'unknown')
-                suggestions.append(f"🔧 Line {line_num}: Code block has deep nesting (depth: {depth}) - consider extracting to separate functions")
+        if isinstance(node, (ast.If, ast.For, ast.While, ast.With)) and depth > 3:
+            line_num = getattr(node, 'lineno', 'unknown')
+            suggestions.append(f"🔧 Line {line_num}: Code block has deep nesting (depth: {depth}) - consider extracting to separate functions")
     
     return suggestions
-
-def _get_nesting_depth(node, depth=0):
-    """Calculate the maximum nesting depth of a node"""
-    max_depth = depth
-    for child in ast.iter_child_nodes(node):
-        if isinstance(child, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
-            child_depth = _get_nesting_depth(child, depth + 1)
-            max_depth = max(max_depth, child_depth)
-    return max_depth
@@ -0,0 +1,98 @@
+import os
+import time
+import unittest
+
+from cache_manager import FileCache
+
+
+class EnforceSizeLimitTest(unittest.TestCase):
+    def test_incoming_file_survives_when_hot_entries_get_second_chances(self):
+        cache = FileCache(max_files=2)
+        for filename in ('a.py', 'b.py'):
+            file_id = cache.store_file(filename, f"{filename[0]} = 1")
+            cache.get_file(file_id)
+            cache.get_file(file_id)
+
+        incoming_id = cache.store_file('c.py', "c = 1")
+
+        self.assertIsNotNone(cache.get_file(incoming_id))
+        self.assertEqual(len(cache.cache), 2)
+
+    def test_spared_hot_files_keep_their_recency_position(self):
+        cache = FileCache(max_files=2)
+        hot_id = cache.store_file('hot.py', "hot = 1")
+        cache.get_file(hot_id)
+        cache.get_file(hot_id)
+        cache.store_file('cold.py', "cold = 1")
+
+        cache.store_file('new.py', "new = 1")
+
+        recent = [entry['filename'] for entry in cache.get_recent_files()]
+        self.assertEqual(recent, ['new.py', 'hot.py'])
+
+
+class DuplicateDetectionTest(unittest.TestCase):
+    def test_identical_content_returns_the_same_id(self):
+        cache = FileCache()
+        first_id = cache.store_file('a.py', "a = 1")
+
+        self.assertEqual(cache.store_file('a.py', b"a = 1"), first_id)
+        self.assertEqual(len(cache.cache), 1)
+
+    def test_different_filenames_get_separate_entries(self):
+        cache = FileCache()
+        first_id = cache.store_file('a.py', "x = 1")
+        second_id = cache.store_file('b.py', "x = 1")
+
+        self.assertNotEqual(first_id, second_id)
+        self.assertEqual(len(cache.cache), 2)
+
+    def test_expired_duplicate_is_reinserted(self):
+        cache = FileCache()
+        first_id = cache.store_file('a.py', "a = 1")
+        cache.cache[first_id].expires_at = time.time() - 1
+
+        file_id = cache.store_file('a.py', "a = 1")
+
+        cached_file = cache.get_file(file_id)
+        self.assertIsNotNone(cached_file)
+        self.assertGreater(cached_file.expires_at, time.time())
+        self.assertEqual(cached_file.text, "a = 1")
+        self.assertEqual(len(cache.cache), 1)
+
+
+class ParsedCacheTest(unittest.TestCase):
+    def test_markdown_round_trips_for_cached_content(self):
+        cache = FileCache()
+        file_id = cache.store_file('a.py', "a = 1")
+        self.assertIsNone(cache.get_parsed(file_id, 'Python'))
+
+        cache.store_parsed(file_id, 'Python', "# docs")
+
+        self.assertEqual(cache.get_parsed(file_id, 'Python'), "# docs")
+        self.assertEqual(cache.get_parsed(cache.store_file('b.py', "a = 1"), 'Python'), "# docs")
+
+    def test_unknown_file_id_has_no_markdown(self):
+        cache = FileCache()
+        cache.store_parsed('missing.py_0_0', 'Python', "# docs")
+
+        self.assertIsNone(cache.get_parsed('missing.py_0_0', 'Python'))
+
+
+class SpoolEvictionTest(unittest.TestCase):
+    def test_evicted_spool_file_is_unlinked_and_reads_as_a_miss(self):
+        cache = FileCache(max_files=1)
+        file_id = cache.store_file('big.py', "x = 1\n" * 40000)
+        held = cache.get_file(file_id)
+        self.assertIsNotNone(held.spool_path)
+
+        cache.store_file('other.py', "y = 2")
+
+        self.assertIsNone(cache.get_file(file_id))
+        self.assertFalse(os.path.exists(held.spool_path))
+        with self.assertRaises(OSError):
+            held.text
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from suggestor.java_suggestor import suggest_refactor_java, _looks_like_java
+
+
+def _java(*body_lines):
+    """Wrap body lines in a class; the first body line is line 2"""
+    return '\n'.join(("public class Sample {",) + body_lines + ("}",))
+
+
+class StringConcatenationTest(unittest.TestCase):
+    def _string_builder_hits(self, code):
+        return [s for s in suggest_refactor_java(code) if 'StringBuilder' in s]
+
+    def test_concatenation_within_five_lines_of_string_is_flagged(self):
+        code = _java(
+            "    String s = \"\";",
+            "    int a;",
+            "    int b;",
+            "    int c;",
+            "    s += \"x\";",
+        )
+
+        self.assertEqual(self._string_builder_hits(code),
+                         ["⚡ Line 6: Use StringBuilder instead of String concatenation in loops"])
+
+    def test_concatenation_on_the_string_line_is_flagged(self):
+        code = _java("    String s = \"\"; s += \"x\";")
+
+        self.assertEqual(len(self._string_builder_hits(code)), 1)
+
+    def test_concatenation_five_lines_after_string_is_not_flagged(self):
+        code = _java(
+            "    String s = \"\";",
+            "    int a;",
+            "    int b;",
+            "    int c;",
+            "    int d;",
+            "    s += \"x\";",
+        )
+
+        self.assertEqual(self._string_builder_hits(code), [])
+
+    def test_concatenation_without_string_is_not_flagged(self):
+        code = _java("    int total = 0;", "    total += 1;")
+
+        self.assertEqual(self._string_builder_hits(code), [])
+
+
+class NonJavaContentTest(unittest.TestCase):
+    NOT_JAVA = ("⚠️ File extension says Java but the content does not appear to be Java"
+                " - no suggestions generated")
+
+    def test_java_declarations_are_recognised(self):
+        self.assertTrue(_looks_like_java("package com.example;"))
+        self.assertTrue(_looks_like_java("interface Shape {}"))
+        self.assertTrue(_looks_like_java("void run() {}"))
+
+    def test_text_without_declarations_gets_the_diagnostic_only(self):
+        code = "def main():\n    print('hello')\n"
+
+        self.assertFalse(_looks_like_java(code))
+        self.assertEqual(suggest_refactor_java(code), [self.NOT_JAVA])
+
+    def test_empty_and_blank_files_are_not_diagnosed(self):
+        self.assertEqual(suggest_refactor_java(""), [])
+        self.assertEqual(suggest_refactor_java("  \n\t\n"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from suggestor.javascript_suggestor import suggest_refactor_javascript
+
+
+class MinifiedOrBinaryTest(unittest.TestCase):
+    MINIFIED = ("⚠️ File appears to be minified - no suggestions generated,"
+                " analyze the unminified source instead")
+    BINARY = "⚠️ File appears to be binary - no suggestions generated"
+
+    def test_line_longer_than_2000_characters_is_minified(self):
+        short_lines = "\n" * 9
+        self.assertNotIn(self.MINIFIED, suggest_refactor_javascript("x" * 2000 + short_lines))
+        self.assertEqual(suggest_refactor_javascript("x" * 2001 + short_lines), [self.MINIFIED])
+
+    def test_average_line_longer_than_500_characters_is_minified(self):
+        self.assertNotIn(self.MINIFIED, suggest_refactor_javascript("x" * 500))
+        self.assertEqual(suggest_refactor_javascript("x" * 501), [self.MINIFIED])
+
+    def test_nul_byte_means_binary(self):
+        self.assertEqual(suggest_refactor_javascript("let a = 1;\x00\n"), [self.BINARY])
+
+
+class EqualityOperatorTest(unittest.TestCase):
+    LOOSE_EQUALITY = "🔧 Line 1: Use strict equality (===) instead of loose equality (==)"
+    LOOSE_INEQUALITY = "🔧 Line 1: Use strict inequality (!==) instead of loose inequality (!=)"
+
+    def _equality_hits(self, code):
+        return [s for s in suggest_refactor_javascript(code) if 'strict' in s]
+
+    def test_loose_equality_is_flagged(self):
+        self.assertEqual(self._equality_hits("if (a == b) {}"), [self.LOOSE_EQUALITY])
+
+    def test_strict_operators_are_not_flagged(self):
+        self.assertEqual(self._equality_hits("if (a === b) {}"), [])
+        self.assertEqual(self._equality_hits("if (a !== b) {}"), [])
+
+    def test_loose_inequality_gets_only_the_inequality_message(self):
+        self.assertEqual(self._equality_hits("if (a != b) {}"), [self.LOOSE_INEQUALITY])
+
+
+class DeepNestingTest(unittest.TestCase):
+    def _nesting_hits(self, code):
+        return [s for s in suggest_refactor_javascript(code) if 'Deep nesting' in s]
+
+    def test_function_indented_more_than_twelve_characters_is_flagged(self):
+        code = "let a = 1;\n" + " " * 13 + "function inner() {}"
+
+        self.assertEqual(self._nesting_hits(code),
+                         ["🔧 Line 2: Deep nesting detected - consider using Promises or async/await"])
+
+    def test_function_indented_twelve_characters_is_not_flagged(self):
+        code = "let a = 1;\n" + " " * 12 + "function inner() {}"
+
+        self.assertEqual(self._nesting_hits(code), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import asyncio
+import unittest
+import importlib.util
+
+from cache_manager import file_cache
+
+HAS_FASTAPI = importlib.util.find_spec('fastapi') is not None
+
+if HAS_FASTAPI:
+    from services.parsing_service import parse_code_endpoint
+    from services.suggestion_service import suggest_refactoring
+
+
+@unittest.skipUnless(HAS_FASTAPI, "fastapi is not installed")
+class CachedFileIdTest(unittest.TestCase):
+    def setUp(self):
+        file_cache.clear_cache()
+
+    def test_unknown_file_id_is_reported_as_not_found(self):
+        for endpoint in (parse_code_endpoint, suggest_refactoring):
+            response = asyncio.run(endpoint(file=None, file_id='missing.py_0_0'))
+
+            self.assertEqual(response['error'], "File not found")
+            self.assertEqual(response['file_id'], 'missing.py_0_0')
+
+    def test_request_without_file_or_file_id_is_rejected(self):
+        for endpoint in (parse_code_endpoint, suggest_refactoring):
+            response = asyncio.run(endpoint(file=None, file_id=None))
+
+            self.assertEqual(response['error'], "No file provided")
+
+    def test_cached_upload_reuses_stored_markdown(self):
+        file_id = file_cache.store_file('sample.py', "def f():\n    pass\n")
+        file_cache.store_parsed(file_id, 'Python', "# cached docs")
+
+        response = asyncio.run(parse_code_endpoint(file=None, file_id=file_id))
+
+        body = json.loads(response.body)
+        self.assertEqual(body['uploaded_file_id'], file_id)
+        self.assertEqual(body['markdown_content'], "# cached docs")
+
+    def test_cached_upload_stores_generated_markdown(self):
+        file_id = file_cache.store_file('sample.py', "def f():\n    pass\n")
+
+        response = asyncio.run(parse_code_endpoint(file=None, file_id=file_id))
+
+        body = json.loads(response.body)
+        self.assertEqual(file_cache.get_parsed(file_id, 'Python'), body['markdown_content'])
+
+    def test_cached_upload_reuses_stored_suggestions(self):
+        file_id = file_cache.store_file('sample.py', "x = 1\n")
+        file_cache.store_suggestions(file_id, 'Python', ["cached suggestion"])
+
+        response = asyncio.run(suggest_refactoring(file=None, file_id=file_id))
+
+        body = json.loads(response.body)
+        self.assertEqual(body['uploaded_file_id'], file_id)
+        self.assertEqual(body['suggestions'], ["cached suggestion"])
+
+
+if __name__ == '__main__':
+    unittest.main()